@@ -0,0 +1 @@
+"""라운드랩 대시보드 분석 패키지 (Streamlit 없이 import 가능한 데이터/분석 로직)."""
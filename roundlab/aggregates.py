@@ -0,0 +1,84 @@
+"""데이터셋 단위 집계 (유저별 key 구매 횟수, 일별 key 건수) - 조각 추가 시 새 행만 더한다.
+
+- user_counts: (유저 × 멤버십 key) 구매 건수 희소 행렬
+- daily: (날짜 × brand_bits 값) 건수. 비트 조합별로 세어 두므로 key 하나든 여러 key 의 합집합이든
+  정확한 건수를 다시 스캔 없이 꺼낼 수 있다.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from roundlab.brand_index import BITS_COLUMN, KEYS, bit_of
+from roundlab.schema import MISSING_USER
+
+AGGREGATES_VERSION = 1  # 집계 로직을 바꾸면 올려서 .features/ 의 예전 aggregates-*.pkl 을 무효화
+AGGREGATE_PARAMS = {'version': AGGREGATES_VERSION}  # load_or_build 캐시 키
+
+
+def _user_key_counts(users, bits, n_users):
+    """행 단위 (user, bits) → (n_users + 1) × len(KEYS) 건수 행렬 (0 행 = user_id 결측 MISSING_USER)."""
+    rows, cols = [], []
+    for j, key in enumerate(KEYS):
+        hit = (bits & bit_of(key)) != 0
+        rows.append(users[hit] + 1)
+        cols.append(np.full(hit.sum(), j, dtype=np.int32))
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    mat = sp.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n_users + 1, len(KEYS)))
+    mat.sum_duplicates()
+    return mat
+
+
+def _daily_counts(dates, bits):
+    """날짜(일) × brand_bits 값 건수 (날짜 결측 행 제외)."""
+    ok = ~np.isnat(dates)
+    frame = pd.DataFrame({'day': dates[ok].astype('datetime64[D]'), 'bits': bits[ok]})
+    return frame.groupby(['day', 'bits']).size().unstack(fill_value=0)
+
+
+class DatasetAggregates:
+    """브랜드 멤버십 기준 유저별 구매 횟수 / 기간별 건수."""
+
+    def __init__(self, df):
+        self.n_rows = 0
+        self.user_counts = sp.csr_matrix((1, len(KEYS)), dtype=np.int32)
+        self.daily = pd.DataFrame()
+        self._add(df, 0)
+
+    def _add(self, df, start):
+        users = df['user_id'].to_numpy()
+        bits = df[BITS_COLUMN].to_numpy()[start:]
+        n_users = int(users.max()) + 1 if len(users) else 0
+
+        self.user_counts.resize((n_users + 1, len(KEYS)))
+        self.user_counts = self.user_counts + _user_key_counts(users[start:], bits, n_users)
+
+        delta = _daily_counts(df['date'].to_numpy()[start:], bits)
+        self.daily = self.daily.add(delta, fill_value=0).fillna(0).astype(np.int64).sort_index().sort_index(axis=1)
+        self.n_rows = len(df)
+
+    def extend(self, df, n_old):
+        """df 앞 n_old 행으로 만든 집계에 뒤에 붙은 행(새 조각)만 더한다."""
+        self._add(df, n_old)
+        return self
+
+    def user_purchases(self, key):
+        """key 구매 유저별 구매 횟수 (0 회 유저 / user_id 결측 제외, user_id 인덱스)."""
+        col = self.user_counts[:, KEYS.index(key)].tocoo()
+        s = pd.Series(col.data, index=pd.Index(col.row - 1, name='user_id'), name='count')
+        return s[(s > 0) & (s.index != MISSING_USER)]
+
+    def _columns(self, keys):
+        """daily 의 brand_bits 값 컬럼 중 keys 가운데 하나라도 켜진 것."""
+        mask = np.bitwise_or.reduce([bit_of(k) for k in keys])
+        return [c for c in self.daily.columns if c & mask]
+
+    def period_counts(self, keys, freq='M'):
+        """기간(freq) × key 건수 DataFrame (key 마다 그 비트가 켜진 행 수)."""
+        periods = self.daily.index.to_period(freq)
+        out = {k: self.daily[self._columns([k])].sum(axis=1) for k in keys}
+        return pd.DataFrame(out, index=self.daily.index).groupby(periods).sum()
+
+    def period_total(self, keys, freq='M'):
+        """기간(freq)별로 keys 중 하나라도 해당하는 행 수 (합집합, 중복 없이)."""
+        periods = self.daily.index.to_period(freq)
+        return self.daily[self._columns(keys)].sum(axis=1).groupby(periods).sum()
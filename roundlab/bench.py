@@ -0,0 +1,193 @@
+"""분석 함수 벤치마크 (Streamlit 없이 실행).
+
+합성 데이터(roundlab.synthetic)를 크기별로 만들어 임시 폴더에 data_part*.parquet 로 쓰고,
+로드부터 각 분석 함수까지 함수마다 다음을 기록한다.
+- wall: 실행 시간 (repeat 회 중 최소 / 중앙값)
+- rss: 실행 중 프로세스 RSS 최고치 - 실행 직전 RSS (MB, 백그라운드 샘플링)
+- alloc_peak / alloc_retained: tracemalloc 기준 최대 할당량 / 끝나고 남은 할당량 (MB, 별도 1회 실행)
+  (Python 객체 + numpy 버퍼. Arrow 메모리 풀은 tracemalloc 에 안 잡혀 arrow_retained 로 따로 기록)
+
+    python -m roundlab.bench --sizes 100k,1m --repeat 3 --out bench.json
+    python -m roundlab.bench --sizes 100k --baseline bench.json   # 기준보다 느려진 함수 표시
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pyarrow as pa
+
+from roundlab import bootstrap, engine, model, sketch
+from roundlab.aggregates import DatasetAggregates
+from roundlab.basket import BasketIndex
+from roundlab.brand_index import KEYS, key_mask
+from roundlab.cadence import user_cadence
+from roundlab.cohorts import Cohorts
+from roundlab.feature_store import STORE_DIRNAME, compute_row_features, load_dataset
+from roundlab.loader import find_parts
+from roundlab.network import copurchase_graph
+from roundlab.synthetic import generate, parse_size, write_parts
+from roundlab.terms import TermIndex
+from roundlab.trace import MB, RssSampler
+from roundlab.transitions import TransitionIndex
+
+
+def measure(fn, repeat=3):
+    """fn() 의 실행 시간 / RSS 증가 / 할당량."""
+    walls, rss = [], 0
+    for _ in range(repeat):
+        gc.collect()
+        with RssSampler() as sampler:
+            t0 = time.perf_counter()
+            fn()
+            walls.append(time.perf_counter() - t0)
+        rss = max(rss, sampler.delta)
+
+    gc.collect()
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    arrow = pa.total_allocated_bytes() - arrow_before
+    del result
+    return {'wall_min': min(walls), 'wall_median': statistics.median(walls), 'rss_mb': rss / MB,
+            'alloc_peak_mb': peak / MB, 'alloc_retained_mb': retained / MB, 'arrow_retained_mb': arrow / MB}
+
+
+class Context:
+    """크기 하나에 대한 벤치마크 입력 (임시 데이터 폴더 + 로드된 df + 집계)."""
+
+    def __init__(self, n_rows, seed=0):
+        self.n_rows = n_rows
+        self.data_dir = tempfile.mkdtemp(prefix='roundlab-bench-')
+        write_parts(generate(n_rows, seed=seed), self.data_dir)
+        self.df = self.load()
+        self.agg = DatasetAggregates(self.df)
+        self.cohorts = Cohorts(self.df, self.agg)   # 앱처럼 세그먼트 / 장바구니·n-gram 행렬은 분석 간 공유
+        self.basket = BasketIndex(self.df)
+        self.terms = TermIndex(self.df)
+
+    def load(self):
+        return load_dataset(self.data_dir)
+
+    def load_cold(self):
+        """.features/ 캐시를 지우고 로드 (파생 피처 계산 포함)."""
+        shutil.rmtree(os.path.join(self.data_dir, STORE_DIRNAME), ignore_errors=True)
+        return self.load()
+
+    def close(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+# 이름 → fn(ctx). 새 분석 함수를 만들면 여기에 등록한다.
+CASES = {
+    'load_data (cold)': lambda c: c.load_cold(),
+    'load_data (warm)': lambda c: c.load(),
+    'part_stats': lambda c: [sketch.part_stats(p) for p in find_parts(c.data_dir)],
+    'dataset_stats (warm)': lambda c: sketch.dataset_stats(c.data_dir).kpis(),
+    'row_features': lambda c: compute_row_features(c.df),
+    'aggregates': lambda c: DatasetAggregates(c.df),
+    'product_ranking': lambda c: engine.product_ranking(c.df),
+    'market_share': lambda c: engine.market_share(c.agg),
+    'market_share (weekly)': lambda c: engine.market_share(c.agg, freq='W'),
+    'cohorts': lambda c: [Cohorts(c.df, c.agg).segments(k) for k in KEYS],
+    'repurchase_stats': lambda c: engine.repurchase_stats(c.df, c.cohorts),
+    'attribute_lift': lambda c: engine.attribute_lift(c.df, '라운드랩', c.cohorts),
+    'basket_index': lambda c: BasketIndex(c.df),
+    'frequency_basket': lambda c: engine.frequency_basket(c.df, '라운드랩', c.cohorts, c.basket),
+    'aha_moment': lambda c: engine.aha_moment(c.df, cohorts=c.cohorts),
+    'transitions': lambda c: TransitionIndex(c.df),
+    'cadence': lambda c: user_cadence(c.df, key_mask(c.df, 'product:라운드랩')),
+    'cadence_table': lambda c: engine.cadence_table(c.df),
+    'churn_voice': lambda c: engine.churn_voice(c.df, cohorts=c.cohorts),
+    'term_index': lambda c: TermIndex(c.df),
+    'contrast_keywords': lambda c: engine.contrast_keywords(c.df, c.terms, cohorts=c.cohorts),
+    'skin_distribution': lambda c: engine.skin_distribution(c.df),
+    'skin_distribution (cohort)': lambda c: engine.skin_distribution(c.df, by='cohort', cohorts=c.cohorts),
+    'network': lambda c: copurchase_graph(c.df),
+    'repurchase_model': lambda c: model.fit_all(c.df, cohorts=c.cohorts),
+    'bootstrap (lift)': lambda c: bootstrap.lift_intervals(c.df, cohorts=c.cohorts),
+    'bootstrap (repurchase)': lambda c: bootstrap.repurchase_intervals(c.df, cohorts=c.cohorts),
+    'bootstrap (aha)': lambda c: bootstrap.aha_intervals(c.df, cohorts=c.cohorts),
+    'bootstrap (voice)': lambda c: bootstrap.churn_voice_intervals(c.df, cohorts=c.cohorts),
+}
+
+
+def run(sizes, repeat=3, only=None, seed=0, log=print):
+    """sizes(행 수 목록) × CASES 벤치마크. 반환: [{'size', 'case', 측정값...}, ...]."""
+    results = []
+    for n in sizes:
+        log(f"== {n:,}행 데이터 생성")
+        ctx = Context(n, seed=seed)
+        try:
+            for name, fn in CASES.items():
+                if only and not any(fnmatch.fnmatch(name, pat) for pat in only):
+                    continue
+                row = {'size': n, 'case': name, **measure(lambda: fn(ctx), repeat)}
+                results.append(row)
+                log(f"{name:<22} {row['wall_min'] * 1000:10.1f} ms  rss +{row['rss_mb']:8.1f} MB"
+                    f"  alloc {row['alloc_peak_mb']:8.1f} MB")
+        finally:
+            ctx.close()
+    return results
+
+
+def compare(results, baseline, tolerance=1.2):
+    """기준 결과 대비 wall_min 이 tolerance 배 이상 느려진 (size, case) 목록."""
+    base = {(r['size'], r['case']): r for r in baseline}
+    slower = []
+    for r in results:
+        b = base.get((r['size'], r['case']))
+        if b and b['wall_min'] > 0 and r['wall_min'] / b['wall_min'] >= tolerance:
+            slower.append((r['size'], r['case'], r['wall_min'] / b['wall_min']))
+    return slower
+
+
+def environment():
+    import pandas as pd
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'pyarrow': pa.__version__}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='라운드랩 대시보드 분석 함수 벤치마크')
+    parser.add_argument('--sizes', default='100k', help='쉼표로 구분한 행 수 (예: 100k,1m,10m)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', help='쉼표로 구분한 case 이름 패턴 (예: "load*,aha*")')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=1.2, help='이 배수 이상 느려지면 회귀로 표시')
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    only = args.only.split(',') if args.only else None
+    results = run(sizes, args.repeat, only, args.seed)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            slower = compare(results, json.load(f)['results'], args.tolerance)
+        for n, name, ratio in slower:
+            print(f"[회귀] {n:,}행 {name}: {ratio:.2f}배 느려짐")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
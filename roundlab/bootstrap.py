@@ -0,0 +1,202 @@
+"""유저 단위 부트스트랩 신뢰구간 (Lift / 비율 지표의 95% 구간).
+
+지표는 전부 '그룹 유저들의 분자 합 / 분모 합' 꼴이다 (행 단위 언급률 = 유저별 언급 행 수 합 / 리뷰 수 합).
+그래서 행이 아니라 유저별로 미리 합친 (분자 행렬, 분모 벡터)만 두고
+- 재표본 = 그룹 유저 n 명을 복원추출한 횟수 = 다항분포 가중치 W (재표본 수 × n)
+- 재표본 지표 = (W @ 분자) / (W @ 분모) 행렬 곱 한 번 (속성 / 키워드 전부 같이)
+으로 계산한다. 두 그룹 비교(Lift / Gap)는 그룹마다 따로 복원추출(층화)한다.
+브랜드(작업)별로 roundlab.parallel.pool_map 프로세스 풀에서 돌리고, 작업마다 SeedSequence 로 시드를 나눠
+풀 크기와 무관하게 같은 결과가 나온다. 구간은 백분위수(2.5% / 97.5%).
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from roundlab.brand_index import key_mask
+from roundlab.cohorts import CHURNED, LOYAL, ONE_TIME, REPEATERS, Cohorts
+from roundlab.constants import CHURN_KEYWORDS, TARGETS
+from roundlab.parallel import pool_map
+from roundlab.schema import text_values
+from roundlab.tagger import ATTR_COLUMN, ATTR_NAMES, STYLE_COLUMN, STYLE_NAMES, bit_matrix, user_bits
+
+N_RESAMPLES = 1000
+LEVEL = 0.95
+BATCH_CELLS = 4_000_000      # 가중치 행렬 한 묶음의 최대 칸 수 (재표본 수 × 유저 수)
+PARALLEL_MIN_WORK = 2 * 10**8  # 재표본 수 × 유저 수 합이 이보다 작으면 풀 없이 (프로세스 기동 비용이 더 큼)
+
+
+def user_sums(idx, values, members):
+    """members(유저 코드 + 1 bool) 유저별 (values 열 합 행렬, 행 수) - 행 루프 없이 bincount.
+
+    idx: 행별 유저 코드 + 1, values: 행 × k 배열 (members 밖 유저의 행은 버린다).
+    """
+    users = np.flatnonzero(members)
+    pos = np.full(len(members), -1, dtype=np.int64)
+    pos[users] = np.arange(len(users))
+    u = pos[idx]
+    keep = u >= 0
+    u, values = u[keep], np.asarray(values)[keep]
+    num = np.zeros((len(users), values.shape[1]))
+    for j in range(values.shape[1]):
+        num[:, j] = np.bincount(u, weights=values[:, j], minlength=len(users))
+    return num, np.bincount(u, minlength=len(users)).astype(np.float64)
+
+
+def multinomial_weights(rng, n, size):
+    """복원추출 size 번의 유저별 뽑힌 횟수 (size × n) = Multinomial(n, 1/n) 가중치."""
+    draws = rng.integers(0, n, size=(size, n)) + (np.arange(size) * n)[:, None]
+    return np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+
+
+def ratio_replicates(num, den, n_resamples, rng):
+    """(유저 × k 분자, 유저 분모) → 재표본 × k 의 Σw·분자 / Σw·분모 (유저 0 명이면 NaN)."""
+    n, k = num.shape
+    out = np.full((n_resamples, k), np.nan)
+    if n == 0:
+        return out
+    batch = max(1, min(n_resamples, BATCH_CELLS // n))
+    for start in range(0, n_resamples, batch):
+        W = multinomial_weights(rng, n, min(batch, n_resamples - start))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[start:start + len(W)] = (W @ num) / (W @ den)[:, None]
+    return out
+
+
+def _replicate_job(args):
+    """프로세스 풀 작업 단위: 그룹마다 따로 복원추출한 재표본 지표 목록."""
+    groups, n_resamples, seed = args
+    rng = np.random.default_rng(seed)
+    return [ratio_replicates(num, den, n_resamples, rng) for num, den in groups]
+
+
+def run_jobs(jobs, n_resamples=N_RESAMPLES, seed=0, processes=None):
+    """jobs: [[(분자, 분모), ...] 그룹 목록, ...] → 작업별 [재표본 × k 배열, ...] (작업 순서 유지)."""
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+    if processes is None:
+        work = sum(len(den) for groups in jobs for _, den in groups) * n_resamples
+        processes = None if work >= PARALLEL_MIN_WORK else 1
+    return pool_map(_replicate_job, [(groups, n_resamples, s) for groups, s in zip(jobs, seeds)], processes)
+
+
+def interval(reps, level=LEVEL):
+    """재표본 × k → (하한, 상한) 백분위수 구간 (NaN 재표본은 무시)."""
+    tail = (1 - level) / 2 * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # 재표본이 전부 NaN 인 열 (All-NaN slice)
+        low, high = np.nanpercentile(reps, [tail, 100 - tail], axis=0)
+    return low, high
+
+
+def _ratio(num, den):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return num.sum(axis=0) / den.sum()
+
+
+def _lift(a, b):
+    """a / b (b 가 0 이면 engine 과 같이 0, 둘 다 결측이면 NaN)."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(b > 0, a / np.where(b > 0, b, 1), np.where(np.isnan(b), np.nan, 0))
+
+
+# -----------------------------------------------------------------------------
+# 지표별 신뢰구간 표 (engine 의 같은 이름 지표에 CI Low / CI High 를 붙인 long DataFrame)
+# -----------------------------------------------------------------------------
+def _brand_attr_sums(df, brand, cohorts, segment_groups):
+    """brand 리뷰의 속성 비트 유저별 합 - segment_groups(세그먼트 튜플) 마다 (분자, 분모)."""
+    key = f'brand:{brand}'
+    b_mask = key_mask(df, key)
+    idx = df['user_id'].to_numpy().astype(np.int64)[b_mask] + 1
+    bits = bit_matrix(df[ATTR_COLUMN].to_numpy()[b_mask], len(ATTR_NAMES))
+    seg = cohorts.segments(key)
+    return [user_sums(idx, bits, np.isin(seg, segs)) for segs in segment_groups]
+
+
+def lift_intervals(df, brands=TARGETS, cohorts=None, n_resamples=N_RESAMPLES, seed=0, processes=None):
+    """브랜드별 속성 Lift (재구매 / 1회 구매 언급률) + 95% 구간. Brand / Attribute / Lift / CI Low / CI High.
+
+    점추정은 engine.attribute_lift 와 같다. 브랜드 안에서는 Lift 큰 순.
+    """
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    brands = list(brands)
+    jobs = [_brand_attr_sums(df, b, cohorts, [REPEATERS, ONE_TIME]) for b in brands]
+    results = run_jobs(jobs, n_resamples, seed, processes)
+    frames = []
+    for brand, groups, (rep, one) in zip(brands, jobs, results):
+        (rep_num, rep_den), (one_num, one_den) = groups
+        if rep_den.sum() == 0 or one_den.sum() == 0:
+            continue
+        low, high = interval(_lift(rep, one))
+        frame = pd.DataFrame({'Brand': brand, 'Attribute': ATTR_NAMES,
+                              'Lift': _lift(_ratio(rep_num, rep_den), _ratio(one_num, one_den)),
+                              'CI Low': low, 'CI High': high})
+        frames.append(frame.sort_values('Lift', ascending=False, kind='stable'))
+    if not frames:
+        return pd.DataFrame(columns=['Brand', 'Attribute', 'Lift', 'CI Low', 'CI High'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def repurchase_intervals(df, brands=TARGETS, cohorts=None, n_resamples=N_RESAMPLES, seed=0, processes=None):
+    """브랜드별 재구매 유저 리뷰의 속성 언급률(%) + 95% 구간. Brand / Attribute / Rate(%) / CI Low / CI High.
+
+    점추정은 engine.repurchase_stats 와 같다.
+    """
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    brands = list(brands)
+    jobs = [_brand_attr_sums(df, b, cohorts, [REPEATERS]) for b in brands]
+    results = run_jobs(jobs, n_resamples, seed, processes)
+    frames = []
+    for brand, [(num, den)], [reps] in zip(brands, jobs, results):
+        if den.sum() == 0:
+            continue
+        low, high = interval(reps * 100)
+        frames.append(pd.DataFrame({'Brand': brand, 'Attribute': ATTR_NAMES, 'Rate(%)': _ratio(num, den) * 100,
+                                    'CI Low': low, 'CI High': high}))
+    if not frames:
+        return pd.DataFrame(columns=['Brand', 'Attribute', 'Rate(%)', 'CI Low', 'CI High'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _contrast_table(label, names, a, b, reps_a, reps_b, a_col, b_col, gap_col):
+    """두 그룹 비율(%) / Lift / Gap 점추정 + 각 지표의 '<지표> Low' / '<지표> High' 구간 컬럼."""
+    rate_a, rate_b = _ratio(*a) * 100, _ratio(*b) * 100
+    reps_a, reps_b = reps_a * 100, reps_b * 100
+    table = pd.DataFrame({label: names, a_col: rate_a, b_col: rate_b})
+    for col, point, reps in [(a_col, rate_a, reps_a), (b_col, rate_b, reps_b),
+                             ('Lift', _lift(rate_a, rate_b), _lift(reps_a, reps_b)),
+                             (gap_col, rate_a - rate_b, reps_a - reps_b)]:
+        table[col] = point
+        table[f'{col} Low'], table[f'{col} High'] = interval(reps)
+    return table
+
+
+def aha_intervals(df, key='dokdo_toner', cohorts=None, n_resamples=N_RESAMPLES, seed=0, processes=None):
+    """engine.aha_moment 의 찐팬(REPEATERS) / 이탈(CHURNED) 패션 태그 보유율 · Lift · Gap + 95% 구간.
+
+    유저 단위 0/1 태그라 분모는 유저 1 명당 1. 반환 순서는 aha_moment 와 같이 Lift 큰 순.
+    """
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    seg = cohorts.segments(key)
+    rep, churn = np.isin(seg, REPEATERS), seg == CHURNED
+    idx = df['user_id'].to_numpy().astype(np.int64) + 1
+    fashion = (rep | churn)[idx] & ~key_mask(df, 'beauty')
+    tags = bit_matrix(user_bits(idx[fashion], df[STYLE_COLUMN].to_numpy()[fashion], len(seg)), len(STYLE_NAMES))
+    groups = [(tags[m].astype(np.float64), np.ones(int(m.sum()))) for m in (rep, churn)]
+    [(reps_rep, reps_churn)] = run_jobs([groups], n_resamples, seed, processes)
+    table = _contrast_table('Category', STYLE_NAMES, *groups, reps_rep, reps_churn, 'Loyal(%)', 'Churn(%)', 'Gap(%p)')
+    return table.sort_values('Lift', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def churn_voice_intervals(df, keywords=CHURN_KEYWORDS, key='dokdo', cohorts=None, n_resamples=N_RESAMPLES,
+                          seed=0, processes=None):
+    """engine.churn_voice 의 1회 구매(ONE_TIME) / 찐팬(LOYAL) 리뷰 키워드 언급률(%) · Lift · Gap + 95% 구간, Gap 큰 순."""
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    k_mask = key_mask(df, key)
+    idx = df['user_id'].to_numpy().astype(np.int64)[k_mask] + 1
+    text = text_values(df.loc[k_mask, 'content'])
+    hits = np.column_stack([text.str.contains(kw).to_numpy(dtype=np.float64) for kw in keywords])
+    seg = cohorts.segments(key)
+    groups = [user_sums(idx, hits, np.isin(seg, segs)) for segs in (ONE_TIME, (LOYAL,))]
+    [(reps_churn, reps_loyal)] = run_jobs([groups], n_resamples, seed, processes)
+    table = _contrast_table('Keyword', list(keywords), *groups, reps_churn, reps_loyal, 'Churn', 'Loyal', 'Gap')
+    return table.sort_values('Gap', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,61 @@
+"""브랜드/제품군 멤버십 인덱스.
+
+데이터 로드 때 한 번, 모든 타겟 브랜드(brand_kw)·제품군(brand_kw & prod_kw)·독도 토너 등의
+소속 여부를 행마다 비트셋(brand_bits 컬럼)으로 계산해 둔다.
+이후 분석 함수는 정규식을 다시 돌리지 않고 key_mask(df, key) 로 비트만 꺼내 쓴다.
+"""
+import numpy as np
+
+from roundlab.constants import BEAUTY_KEYWORDS, TARGETS
+from roundlab.schema import bits_dtype, contains
+
+BITS_COLUMN = 'brand_bits'
+
+
+def build_rules(targets=TARGETS):
+    """key → (브랜드 패턴, [상품명 패턴(모두 만족)], 대소문자 구분 여부)."""
+    rules = {}
+    for b, f in targets.items():
+        rules[f'brand:{b}'] = (f['brand_kw'], [], False)
+        rules[f'product:{b}'] = (f['brand_kw'], [f['prod_kw']], False)
+    rules['roundlab'] = ('라운드랩', [], True)                  # 라운드랩 전체
+    rules['dokdo'] = ('라운드랩', ['독도'], True)                # 라운드랩 독도 라인
+    rules['dokdo_toner'] = ('라운드랩', ['독도', '토너'], True)  # 라운드랩 독도 토너
+    rules['beauty'] = ('|'.join(BEAUTY_KEYWORDS), [], True)      # 뷰티(화장품) 브랜드
+    return rules
+
+
+RULES = build_rules()
+KEYS = list(RULES)
+
+
+def compute_brand_bits(df, rules=RULES):
+    """rules 의 각 key 를 비트 하나로 하는 행 단위 멤버십 배열."""
+    bits = np.zeros(len(df), dtype=bits_dtype(len(rules)))
+    for i, (brand_pat, goods_pats, case) in enumerate(rules.values()):
+        mask = contains(df['brand'], brand_pat, case=case)
+        for pat in goods_pats:
+            mask &= contains(df['goods_name'], pat, case=case)
+        bits |= mask.astype(bits.dtype) << bits.dtype.type(i)
+    return bits
+
+
+def add_brand_index(df):
+    """df 에 brand_bits 컬럼을 붙여 반환 (로드당 한 번)."""
+    if not df.empty:
+        df[BITS_COLUMN] = compute_brand_bits(df)
+    return df
+
+
+def bit_of(key):
+    return 1 << KEYS.index(key)
+
+
+def key_mask(df, key):
+    """key 소속 여부 bool ndarray (정규식 재계산 없음)."""
+    return has_bit(df[BITS_COLUMN].to_numpy(), key)
+
+
+def has_bit(bits, key):
+    """brand_bits 값 배열(shift 등으로 만든 것 포함)에서 key 비트가 켜져 있는지."""
+    return (bits & bit_of(key)) != 0
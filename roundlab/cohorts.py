@@ -0,0 +1,94 @@
+"""유저 코호트(세그먼트) 엔진.
+
+브랜드 멤버십 key 하나에 대해 모든 유저를 구매 횟수 / 마지막 구매 후 경과일로 한 번에 나눈다.
+- 1회 구매 (ONE) / 1회 구매 후 churn_days 일 넘게 재구매 없음 (CHURNED)
+- repeat_min 회 이상 (REPEAT) / loyal_min 회 이상 (LOYAL, 찐팬)
+기준은 Cohorts 생성 인자로 한 번만 정하고, key 별 결과는 유저 코드 → 세그먼트 코드(int8) 배열로
+캐시해 재구매 속성 / Lift / 장바구니 / 아하 모먼트 / 이탈 원인 분석이 같이 쓴다.
+as_of 를 주면 그 날짜까지(날짜 있는 행만)의 구매로 세그먼트를 나눈다 (전체 기간 집계는 쓰지 않는다).
+user_id 결측(MISSING_USER) 행은 유저가 아니므로 어느 세그먼트에도 넣지 않는다 (항상 NONE).
+"""
+import numpy as np
+
+from roundlab.aggregates import DatasetAggregates
+from roundlab.brand_index import KEYS, key_mask
+from roundlab.schema import MISSING_USER
+
+NONE, ONE, CHURNED, REPEAT, LOYAL = range(5)
+SEGMENT_NAMES = {NONE: '미구매', ONE: '1회', CHURNED: '1회 (이탈)', REPEAT: '재구매', LOYAL: '찐팬'}
+
+ONE_TIME = (ONE, CHURNED)      # 1회 구매 전체
+REPEATERS = (REPEAT, LOYAL)    # repeat_min 회 이상 전체
+
+DAY_NS = 86_400 * 10**9
+
+
+class Cohorts:
+    """key 별 유저 세그먼트 (유저 코드 + 1 → 세그먼트 코드, 0 번 = user_id 결측 MISSING_USER 는 항상 NONE)."""
+
+    def __init__(self, df, agg=None, repeat_min=2, loyal_min=3, churn_days=45, as_of=None):
+        if not 2 <= repeat_min <= loyal_min:
+            raise ValueError(f"2 <= repeat_min <= loyal_min 이어야 합니다: {repeat_min}, {loyal_min}")
+        self.repeat_min, self.loyal_min, self.churn_days = repeat_min, loyal_min, churn_days
+
+        self._df = df
+        self._idx = df['user_id'].to_numpy().astype(np.int64) + 1
+        dates = df['date'].to_numpy().astype('datetime64[ns]')
+        self._has_date = ~np.isnat(dates)
+        self._dates = dates.view(np.int64)
+        self.n_users = int(self._idx.max()) + 1 if len(self._idx) else 1  # 유저 코드 + 1 배열 길이
+        # 기준일: 지정하지 않으면 전체 데이터 마지막 날짜 (전체 행 = 기준일까지의 행)
+        if as_of is None:
+            as_of = dates[self._has_date].max() if self._has_date.any() else np.datetime64(0, 'ns')
+            self.agg = DatasetAggregates(df) if agg is None else agg
+            self._cutoff = self._has_date
+        else:
+            self.agg = None
+            self._cutoff = self._has_date & (dates <= np.datetime64(as_of, 'ns'))
+        self.as_of = np.datetime64(as_of, 'ns')
+        self._segments = {}
+
+    def counts(self, key):
+        """유저별 key 구매 횟수 (길이 n_users, user_id 결측 칸은 0). as_of 를 줬으면 기준일까지의 행만."""
+        if self.agg is not None:
+            count = np.asarray(self.agg.user_counts[:, KEYS.index(key)].toarray()).ravel()
+        else:
+            count = np.bincount(self._idx[key_mask(self._df, key) & self._cutoff], minlength=self.n_users)
+        count[MISSING_USER + 1] = 0
+        return count
+
+    def days_since_last(self, key):
+        """유저별 마지막 key 구매(날짜 있는 행, 기준일까지) 후 기준일까지 경과일 (구매 없으면 -1)."""
+        target = key_mask(self._df, key) & self._cutoff & (self._idx != MISSING_USER + 1)
+        last = np.full(self.n_users, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(last, self._idx[target], self._dates[target])
+        bought = last != np.iinfo(np.int64).min
+        days = np.full(self.n_users, -1, dtype=np.int64)
+        days[bought] = (self.as_of.view(np.int64) - last[bought]) // DAY_NS
+        return days
+
+    def segments(self, key):
+        """유저 코드 + 1 → 세그먼트 코드 int8 배열 (key 마다 한 번만 계산)."""
+        if key not in self._segments:
+            count = self.counts(key)
+            seg = np.zeros(len(count), dtype=np.int8)
+            one_time = (count >= 1) & (count < self.repeat_min)
+            seg[one_time] = ONE
+            seg[one_time & (self.days_since_last(key) > self.churn_days)] = CHURNED
+            seg[count >= self.repeat_min] = REPEAT
+            seg[count >= self.loyal_min] = LOYAL
+            self._segments[key] = seg
+        return self._segments[key]
+
+    def row_segments(self, key):
+        """df 행마다 그 유저의 key 세그먼트."""
+        return self.segments(key)[self._idx]
+
+    def rows(self, key, segments):
+        """유저가 segments 중 하나에 속하는 df 행 bool 마스크."""
+        return np.isin(self.row_segments(key), segments)
+
+    def sizes(self, key):
+        """세그먼트 이름 → 유저 수."""
+        counts = np.bincount(self.segments(key), minlength=len(SEGMENT_NAMES))
+        return {name: int(counts[code]) for code, name in SEGMENT_NAMES.items()}
@@ -0,0 +1,53 @@
+"""분석 정의 상수 (타겟 브랜드/제품군 키워드, 속성 키워드)."""
+
+# 타겟 브랜드 및 키워드
+TARGET_BRANDS = ['라운드랩', '토리든', '에스네이처', '아비브', '토니모리']
+TARGETS = {
+    '라운드랩':  {'brand_kw': r'라운드랩|Round\s*Lab|독도', 'prod_kw': r'토너|스킨|독도'},
+    '에스네이처': {'brand_kw': r'에스네이처|S\.NATURE|SNATURE', 'prod_kw': r'토너|스킨'},
+    '토리든':    {'brand_kw': r'토리든|Torriden',    'prod_kw': r'토너|스킨'},
+    '아비브':    {'brand_kw': r'아비브|Abib',        'prod_kw': r'토너|스킨|부스터'},
+    '토니모리':  {'brand_kw': r'토니모리|TONYMOLY',  'prod_kw': r'모찌|세라마이드|원더'}
+}
+
+# 통합 랭킹용 상품 정규화 규칙: 표시 이름 → 브랜드 패턴 & 상품명 패턴 (둘 다 만족하면 그 이름으로 묶음)
+# 여러 규칙에 걸리면 뒤쪽 규칙이 우선. 새 제품군은 여기에 한 줄 추가하면 된다.
+PRODUCT_RULES = {
+    '🔴 라운드랩 1025 독도 토너 (Total)': {'brand_kw': '라운드랩', 'goods_kw': '독도|토너'},
+    '🔵 토리든 다이브인 토너 (Total)':    {'brand_kw': '토리든', 'goods_kw': '토너'},
+    '🟢 에스네이처 아쿠아 토너 (Total)':  {'brand_kw': '에스네이처', 'goods_kw': '토너|스킨'},
+    '⚪ 아비브 어성초 토너 (Total)':      {'brand_kw': '아비브', 'goods_kw': '토너|패드'},
+    '🟡 토니모리 모찌 토너 (Total)':      {'brand_kw': '토니모리', 'goods_kw': '모찌'},
+}
+
+# 11대 속성 키워드
+PATTERNS = {
+    '수분/보습': r'수분|촉촉', '진정': r'진정|가라앉|뒤집어', '붉은기': r'붉은|홍조|열감',
+    '트러블': r'트러블|여드름|좁쌀', '순함': r'순함|순해|순한', '자극없음': r'자극|따가|아프',
+    '가성비': r'가성비|저렴|싸게|가격|세일|1\+1|양도|용량', '물제형': r'물제형|물같|워터',
+    '산뜻함': r'산뜻|가볍|끈적임없', '흡수력': r'흡수|스며', '무난함': r'무난|호불호|데일리'
+}
+
+# 이탈 원인(Voice) 비교용 불만 키워드
+CHURN_KEYWORDS = ['건조', '좁쌀', '트러블', '끈적', '비싸', '그저', '자극']
+
+# 코호트 기준 (roundlab.cohorts.Cohorts 인자) - 재구매 최소 횟수 / 찐팬 최소 횟수 / 1회 구매 후 이탈 판정 일수
+COHORT_RULES = {'repeat_min': 2, 'loyal_min': 3, 'churn_days': 45}
+
+# 뷰티(화장품) 브랜드 키워드 - 아하 모먼트에서 패션/잡화 구매를 골라낼 때 사용
+BEAUTY_KEYWORDS = ['라운드랩', '토리든', '에스네이처', '아비브', '토니모리', '이니스프리', '닥터지', '아누아', '마녀공장', '메디힐', '성분에디터', '올리브영', '화장솜']
+
+# 라이프스타일(패션 취향) 태그 사전 (한글+영어) - 상품명+옵션 대문자 텍스트에서 부분 문자열 매칭
+LIFESTYLE_TAGS = {
+    '상의 (Basic/T-shirt)': ['반팔', '티셔츠', '롱슬리브', '무지', '탑', '긴팔', 'T-SHIRT', 'TEE', 'BASIC'],
+    '상의 (Sweat/Hoodie)': ['맨투맨', '스웨트', '후드', '집업', '아노락', 'SWEATSHIRT', 'HOODIE', 'MTM'],
+    '상의 (Knit/Shirt)': ['니트', '스웨터', '가디건', '셔츠', 'KNIT', 'CARDIGAN', 'SHIRT'],
+    '아우터 (Outer)': ['패딩', '코트', '자켓', '점퍼', '파카', '플리스', 'PADDING', 'COAT', 'JACKET'],
+    '하의 (Pants/Denim)': ['바지', '팬츠', '데님', '청바지', '슬랙스', '조거', 'PANTS', 'DENIM', 'SLACKS'],
+    '신발 (Shoes)': ['스니커즈', '운동화', '런닝화', '구두', '부츠', 'SNEAKERS', 'SHOES'],
+    '가방/모자 (Bag/Head)': ['가방', '백팩', '메신저백', '모자', '볼캡', '비니', 'BAG', 'CAP', 'HAT'],
+    '속옷/양말/홈 (Inner)': ['양말', '삭스', '드로즈', '팬티', '잠옷', 'SOCKS', 'UNDERWEAR'],
+    '디지털/라이프 (Tech)': ['케이스', '필름', '거치대', '충전기', 'CASE', 'FILM'],
+    '블랙/무채색 (Monotone)': ['블랙', '검정', 'BLACK', '그레이', '회색', 'GREY', 'GRAY', '차콜', '화이트', '흰색', 'WHITE', '네이비', 'NAVY'],
+    '유채색/포인트 (Color)': ['핑크', '블루', '옐로우', '그린', '민트', '라벤더', 'PINK', 'BLUE', 'GREEN']
+}
@@ -0,0 +1,279 @@
+"""대시보드 분석 함수 (Streamlit 없이 호출 가능). 앱은 이 함수들을 캐시로 감싸 렌더링만 한다.
+
+입력은 load_data() 결과 df (파생 피처 컬럼 포함)와, 필요하면 DatasetAggregates / TransitionIndex / Cohorts /
+BasketIndex / TermIndex.
+재구매 / 1회 / 이탈 / 찐팬 구분은 전부 Cohorts(roundlab.cohorts) 세그먼트를 쓴다.
+출력은 차트에 바로 넣을 수 있는 DataFrame / Series / dict.
+"""
+import numpy as np
+import pandas as pd
+
+from roundlab.basket import BasketIndex
+from roundlab.brand_index import key_mask
+from roundlab.cadence import cadence_summary, user_cadence
+from roundlab.cohorts import CHURNED, LOYAL, ONE_TIME, REPEAT, REPEATERS, SEGMENT_NAMES, Cohorts
+from roundlab.constants import CHURN_KEYWORDS, TARGET_BRANDS, TARGETS
+from roundlab.products import PRODUCT_COLUMN, canonical_products
+from roundlab.skin import SKIN_COLUMN, SKIN_TYPES, skin_types
+from roundlab.tagger import STYLE_COLUMN, STYLE_NAMES, attr_rates, attr_rates_by, bit_matrix, user_bits
+from roundlab.terms import TermIndex
+
+# -----------------------------------------------------------------------------
+# Market
+# -----------------------------------------------------------------------------
+def product_ranking(df, top_n=20):
+    """타겟 브랜드 토너 제품군을 하나로 묶은(product 컬럼) 상품별 판매(리뷰) 건수 Top N."""
+    products = df[PRODUCT_COLUMN] if PRODUCT_COLUMN in df.columns else pd.Series(canonical_products(df))
+    top_products = products.value_counts()
+    return top_products[top_products > 0].head(top_n)
+
+
+# 점유율 큐브 집계 단위 (표시 이름 → pandas 기간 코드) / 보기 종류
+FREQS = {'일': 'D', '주': 'W', '월': 'M'}
+SHARE_VIEWS = ('share', 'growth', 'rolling')
+
+
+def share_cube(agg, brands=TARGET_BRANDS, freq='M'):
+    """brands 토너 제품군의 (기간 × 브랜드 건수, 기간별 분모) - 분모 0 인 기간 제외.
+
+    DatasetAggregates 의 일별 × brand_bits 건수를 freq(D/W/M)로 합치기만 하므로 행 재스캔이 없다.
+    분모는 product:{브랜드} 중 하나라도 해당하는 행 수 (합집합).
+    """
+    products = [f'product:{b}' for b in brands]
+    total = agg.period_total(products, freq)
+    total = total[total > 0]
+    counts = agg.period_counts(products, freq).loc[total.index]
+    counts.columns = list(brands)
+    return counts, total
+
+
+def period_labels(index):
+    """PeriodIndex → 차트 x 축 문자열 (월: YYYY-MM, 일/주: 시작일 YYYY-MM-DD)."""
+    if index.freqstr.startswith('M'):
+        return index.astype(str)
+    return index.start_time.strftime('%Y-%m-%d')
+
+
+def share_view(counts, total, view='share', window=3):
+    """큐브 → 기간 × 브랜드 wide DataFrame.
+
+    - share: 점유율(%), 건수 0 인 칸은 NaN
+    - growth: 브랜드 건수의 직전 기간 대비 증감률(%), 직전 건수 0 이면 NaN
+    - rolling: 점유율의 window 기간 이동평균(%)
+    """
+    share = counts.div(total, axis=0) * 100
+    if view == 'share':
+        return share.where(counts > 0)
+    if view == 'growth':
+        prev = counts.shift(1)
+        return ((counts - prev) / prev * 100).where(prev > 0)
+    if view == 'rolling':
+        return share.rolling(window, min_periods=1).mean()
+    raise ValueError(f'알 수 없는 보기: {view} (가능: {SHARE_VIEWS})')
+
+
+def market_share(agg, brands=TARGET_BRANDS, freq='M', view='share', window=3):
+    """brands 토너 제품군 기간별 점유율 long DataFrame (Period / Brand / Value). 값이 없는 칸은 빠진다."""
+    counts, total = share_cube(agg, brands, freq)
+    if total.empty:
+        return pd.DataFrame(columns=['Period', 'Brand', 'Value'])
+
+    wide = share_view(counts, total, view, window)
+    wide.index = period_labels(wide.index)
+    return wide.stack().dropna().rename('Value').rename_axis(['Period', 'Brand']).reset_index()
+
+
+# -----------------------------------------------------------------------------
+# Positioning / Behavior
+# -----------------------------------------------------------------------------
+def repurchase_stats(df, cohorts=None):
+    """타겟 브랜드별 재구매 유저(REPEATERS) 리뷰의 11대 속성 언급 비율(%)."""
+    if df.empty: return pd.DataFrame()
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    results = []
+    for brand in TARGETS:
+        key = f'brand:{brand}'
+        b_mask = key_mask(df, key)
+        if not b_mask.any(): continue
+
+        rep_mask = b_mask & cohorts.rows(key, REPEATERS)
+        if not rep_mask.any(): continue
+
+        # 속성 비트(attr_bits)의 평균 = 각 속성 언급 비율
+        row = {'Brand': brand}
+        row.update(attr_rates(df['attr_bits'].to_numpy()[rep_mask]) * 100)
+        results.append(row)
+    return pd.DataFrame(results).set_index('Brand')
+
+
+def attribute_lift(df, brand_name, cohorts=None):
+    """brand_name 재구매 그룹 / 1회 구매 그룹의 속성 언급 비율 (Lift), 큰 순."""
+    if df.empty: return pd.Series()
+    key = f'brand:{brand_name}'
+    b_mask = key_mask(df, key)
+    if not b_mask.any(): return pd.Series()
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+
+    # 행마다 그 유저의 세그먼트 → 재구매 / 1회 그룹
+    seg = cohorts.row_segments(key)[b_mask]
+    group = np.where(np.isin(seg, REPEATERS), 'rep', np.where(np.isin(seg, ONE_TIME), 'one', ''))
+    rates = attr_rates_by(df['attr_bits'].to_numpy()[b_mask], group)
+    if 'rep' not in rates.index or 'one' not in rates.index: return pd.Series()
+
+    rep_rate, one_rate = rates.loc['rep'], rates.loc['one']
+    lift_data = (rep_rate / one_rate).where(one_rate > 0, 0)
+    return lift_data.sort_values(ascending=False)
+
+
+def frequency_basket(df, brand_name, cohorts=None, basket=None):
+    """brand_name 구매 횟수 그룹(1회/2회/3회+)별로 함께 산 다른 상품 Top 10 (count / lift DataFrame).
+
+    유저 × 상품 희소 행렬(BasketIndex)과 세그먼트 벡터의 곱 한 번으로 세 그룹을 같이 센다.
+    lift = 그룹 내 상품 비중 / 전체 유저 기준 비중.
+    """
+    if df.empty: return {}
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    basket = BasketIndex(df) if basket is None else basket
+    key = f'brand:{brand_name}'
+    seg = cohorts.segments(key)
+    groups = {
+        '1회 (이탈/체험)': np.isin(seg, ONE_TIME),
+        '2회 (재방문)': seg == REPEAT,
+        '3회+ (찐팬)': seg == LOYAL,
+    }
+    return basket.top_items(groups, exclude=key_mask(df, key), top_n=10)
+
+
+def cadence_table(df, brands=TARGETS):
+    """brands 전 브랜드(토너 제품군)의 재구매 주기 요약 (Brand 인덱스)."""
+    rows = []
+    for b in brands:
+        users, gaps = user_cadence(df, key_mask(df, f'product:{b}'))
+        rows.append({'Brand': b, **cadence_summary(users, gaps)})
+    return pd.DataFrame(rows).set_index('Brand')
+
+
+# -----------------------------------------------------------------------------
+# Voice
+# -----------------------------------------------------------------------------
+# 키워드 대조 대상 (표시 이름 → 멤버십 인덱스 key)
+DISCOVERY_KEYS = {'라운드랩 독도': 'dokdo', **{b: f'brand:{b}' for b in TARGETS}}
+
+
+def contrast_keywords(df, terms=None, key='dokdo', a=ONE_TIME, b=(LOYAL,), cohorts=None, method='log_odds', top_k=15):
+    """key 구매 리뷰 중 세그먼트 a 유저 리뷰에서 b 유저 리뷰보다 두드러지는 문자 n-gram Top k.
+
+    TermIndex(문서 × n-gram 희소 행렬)와 행 마스크 두 개의 곱이라 키워드마다 본문을 다시 훑지 않는다.
+    반환: Term / A(%) / B(%) / Score DataFrame (Score 큰 순)
+    """
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    terms = TermIndex(df) if terms is None else terms
+    k_mask = key_mask(df, key)
+    return terms.contrast(k_mask & cohorts.rows(key, a), k_mask & cohorts.rows(key, b), method, top_k)
+
+
+def churn_voice(df, keywords=CHURN_KEYWORDS, key='dokdo', cohorts=None):
+    """key(기본: 독도) 1회 구매 이탈자 vs 찐팬(LOYAL) 리뷰의 불만 키워드 언급률(%), Gap 큰 순."""
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    k_mask = key_mask(df, key)
+    churn_txt = df.loc[k_mask & cohorts.rows(key, ONE_TIME), 'content'].fillna('')
+    loyal_txt = df.loc[k_mask & cohorts.rows(key, (LOYAL,)), 'content'].fillna('')
+    data = []
+    for kw in keywords:
+        data.append({'Keyword': kw, 'Churn': churn_txt.str.contains(kw).mean()*100, 'Loyal': loyal_txt.str.contains(kw).mean()*100})
+    comp_df = pd.DataFrame(data)
+    comp_df['Gap'] = comp_df['Churn'] - comp_df['Loyal']
+    return comp_df.sort_values('Gap', ascending=False)
+
+
+# 피부 타입 분포를 나눠 볼 기준 (표시 이름 → skin_distribution 의 by)
+SKIN_CUTS = {'전체': None, '코호트': 'cohort', '월': 'month'}
+
+
+def _skin_groups(df, brand, by, cohorts):
+    """행 단위 그룹 라벨 (by=None → 전부 '전체', 'cohort' → 그 브랜드 기준 세그먼트, 'month' → 월)."""
+    if by is None:
+        return np.zeros(len(df), dtype=np.int64), pd.Index(['전체'])
+    if by == 'cohort':
+        seg = cohorts.row_segments(f'brand:{brand}')
+        return seg.astype(np.int64), pd.Index(list(SEGMENT_NAMES.values()))
+    if by == 'month':
+        return pd.factorize(df['date'].dt.to_period('M'), sort=True)
+    raise ValueError(f'알 수 없는 기준: {by} (가능: {list(SKIN_CUTS.values())})')
+
+
+def skin_table(df, brands=TARGET_BRANDS, by=None, cohorts=None):
+    """(브랜드, 그룹) × 피부 타입 건수 DataFrame. 브랜드는 TARGETS 브랜드 패턴(brand_bits) 기준.
+
+    skin_type 코드(로드 때 고유 skin_info 값 단위로 파싱)와 그룹 코드를 합친 코드 하나를
+    브랜드마다 bincount 하므로 문자열 재파싱 없이 한 번에 세어진다.
+    """
+    if by == 'cohort' and cohorts is None:
+        cohorts = Cohorts(df)
+    skin = (df[SKIN_COLUMN] if SKIN_COLUMN in df.columns else pd.Series(skin_types(df['skin_info']))).cat.codes.to_numpy()
+    n_skin = len(SKIN_TYPES)
+    frames = {}
+    for b in brands:
+        group, labels = _skin_groups(df, b, by, cohorts)
+        m = key_mask(df, f'brand:{b}') & (skin >= 0) & (group >= 0)
+        counts = np.bincount(group[m] * n_skin + skin[m], minlength=len(labels) * n_skin)
+        frames[b] = pd.DataFrame(counts.reshape(len(labels), n_skin), index=labels, columns=SKIN_TYPES)
+    table = pd.concat(frames, names=['Brand', 'Group'])
+    table.columns.name = 'Skin'
+    return table
+
+
+def skin_distribution(df, brands=TARGET_BRANDS, by=None, cohorts=None):
+    """브랜드(× 그룹)별 피부 타입 비율(%) long DataFrame (Brand / Skin / Pct, by 가 있으면 Group 추가).
+
+    by: None(전체) / 'cohort'(그 브랜드 기준 1회·이탈·재구매·찐팬) / 'month'(월).
+    각 (브랜드, 그룹) 안에서 큰 순, 0 건인 피부 타입은 빠진다.
+    """
+    table = skin_table(df, brands, by, cohorts)
+    long = table.stack().rename('Count').reset_index()
+    long = long[long['Count'] > 0]
+    long['Pct'] = long['Count'] / long.groupby(['Brand', 'Group'])['Count'].transform('sum') * 100
+    # (브랜드, 그룹) 순서는 표 그대로(brands 순 / 그룹 코드 순), 그 안에서는 비율 큰 순
+    long['_block'] = long.groupby(['Brand', 'Group'], sort=False).ngroup()
+    long = long.sort_values(['_block', 'Pct'], ascending=[True, False], kind='stable')
+    columns = ['Brand', 'Skin', 'Pct'] if by is None else ['Brand', 'Group', 'Skin', 'Pct']
+    return long[columns].reset_index(drop=True)
+
+
+# -----------------------------------------------------------------------------
+# Aha
+# -----------------------------------------------------------------------------
+def aha_moment(df, key='dokdo_toner', cohorts=None):
+    """아하 모먼트 분석 (라이프스타일 & 패션 취향 매칭)
+
+    key 재구매 유저(REPEATERS)와 1회 구매 후 이탈한 유저(CHURNED)의
+    패션/잡화 취향 태그 보유율을 비교한다. 유저 단위 루프 없이
+    행 style_bits → 유저별 비트 OR(유저 × 태그 비트 배열) → 그룹별 열 평균.
+    """
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+
+    # 1. 유저 그룹핑 (유저 코드 + 1 → 세그먼트, 0 번 = user_id 결측은 항상 NONE)
+    seg = cohorts.segments(key)
+    rep = np.isin(seg, REPEATERS)
+    churn = seg == CHURNED
+    relevant = rep | churn
+
+    # 2. 비화장품(패션) 구매의 라이프스타일 태그 비트를 유저별로 OR
+    # [핵심] 상품명 + 옵션 텍스트의 태그 매칭은 로드 때 고유 텍스트 단위로 style_bits 에 계산/저장됨
+    idx = df['user_id'].to_numpy().astype(np.int64) + 1
+    fashion = relevant[idx] & ~key_mask(df, 'beauty')
+    u_bits = user_bits(idx[fashion], df[STYLE_COLUMN].to_numpy()[fashion], len(seg))
+    fashion_buyers = np.bincount(idx[fashion], minlength=len(seg)) > 0
+    tags = bit_matrix(u_bits, len(STYLE_NAMES))
+
+    with np.errstate(invalid='ignore'):
+        rep_rates = tags[rep].mean(axis=0) * 100 if rep.any() else np.full(len(STYLE_NAMES), np.nan)
+        churn_rates = tags[churn].mean(axis=0) * 100 if churn.any() else np.full(len(STYLE_NAMES), np.nan)
+
+    result_df = pd.DataFrame({'Category': STYLE_NAMES, 'Loyal(%)': rep_rates, 'Churn(%)': churn_rates})
+    result_df['Lift'] = np.where(churn_rates > 0, rep_rates / np.where(churn_rates > 0, churn_rates, 1), 0)
+    result_df['Gap(%p)'] = rep_rates - churn_rates
+    result_df = result_df.sort_values('Lift', ascending=False)
+    debug_info = {'total_analyzed': int(relevant.sum()), 'fashion_buyers': int(fashion_buyers.sum())}
+
+    return result_df, debug_info
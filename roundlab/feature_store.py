@@ -0,0 +1,279 @@
+"""파생 피처 디스크 캐시 (data_part*.parquet 옆 .features/ 폴더).
+
+- 조각 파일마다: brand_bits / attr_bits / style_bits  (키 = 조각 파일 해시 + 분석 정의 해시)
+- 데이터셋 전체: user_seq = (user_id, date) 정렬 순서  (키 = 모든 조각 해시 + 분석 정의 해시)
+- (캐시 안 함) product: 고유 (brand, goods_name) 쌍 단위 상품명 정규화 (roundlab.products)
+- (캐시 안 함) skin_type: 고유 skin_info 값 단위 피부 타입 (roundlab.skin)
+- 데이터셋 전체 분석 객체(전이 인덱스 등): <종류>-<지문 + 만드는 쪽 설정 해시>.pkl
+  (조각이 뒤에 추가된 경우 예전 지문의 객체를 extend 로 갱신 - 새 조각만 계산)
+- 정규화 + 파생 피처까지 붙인 전체 프레임: frame-<지문>.feather (load_dataset)
+
+Feather(Arrow IPC, 무압축)로 한 번 써 두면 재시작/다른 레플리카는 계산 없이 메모리 매핑으로 읽는다.
+메모리 매핑한 페이지는 OS 페이지 캐시라서 같은 호스트의 프로세스들이 읽기 전용 사본 하나를 같이 쓴다.
+TARGETS / PATTERNS / LIFESTYLE_TAGS 가 바뀌면 정의 해시가 달라져 자동으로 다시 계산된다.
+"""
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from roundlab.brand_index import BITS_COLUMN, RULES, compute_brand_bits
+from roundlab.constants import LIFESTYLE_TAGS, PATTERNS
+from roundlab.loader import find_parts, load_reviews
+from roundlab.products import PRODUCT_COLUMN, add_product_column
+from roundlab.schema import normalize_frame
+from roundlab.skin import SKIN_COLUMN, add_skin_column
+from roundlab.tagger import ATTR_COLUMN, ATTR_TAGGER, STYLE_COLUMN, STYLE_TAGGER, style_text
+
+STORE_DIRNAME = '.features'
+FEATURE_VERSION = 2  # 피처 계산 / 스키마 정규화 로직을 바꾸면 올려서 기존 캐시를 무효화
+SEQ_COLUMN = 'user_seq'
+# Arrow 문자열 컬럼 → Arrow 기반 pandas 문자열 (pandas 3 기본 str 과 같은 dtype).
+# future.infer_string 이 꺼진 환경에서도 object 로 복사하지 않고 Arrow 버퍼를 그대로 쓰게 명시
+ARROW_STR = pd.StringDtype('pyarrow', na_value=np.nan)
+_STRING_TYPES = {pa.string(): ARROW_STR, pa.large_string(): ARROW_STR}
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def definitions_hash():
+    """피처 계산에 쓰이는 분석 정의(브랜드 인덱스 규칙, 속성/라이프스타일 키워드)의 해시."""
+    payload = {'version': FEATURE_VERSION, 'rules': RULES, 'patterns': PATTERNS, 'lifestyle': LIFESTYLE_TAGS}
+    return _digest(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode())
+
+
+_HASH_MEMO = {}
+
+
+def file_hash(path):
+    """파일 내용 해시. 같은 프로세스에서는 (경로, 크기, 수정시각)이 같으면 다시 읽지 않는다."""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if memo_key not in _HASH_MEMO:
+        h = hashlib.blake2b(digest_size=8)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        _HASH_MEMO[memo_key] = h.hexdigest()
+    return _HASH_MEMO[memo_key]
+
+
+def dataset_fingerprint(parts, hashes=None):
+    """조각 파일 전체 + 분석 정의에 대한 지문."""
+    hashes = hashes if hashes is not None else [file_hash(p) for p in parts]
+    return _digest(('|'.join(hashes) + '|' + definitions_hash()).encode())
+
+
+def compute_row_features(df):
+    """행 단위 파생 피처 (브랜드 멤버십 / 리뷰 속성 / 라이프스타일 태그 비트)."""
+    return {
+        BITS_COLUMN: compute_brand_bits(df),
+        ATTR_COLUMN: ATTR_TAGGER.tag(df['content']),
+        STYLE_COLUMN: STYLE_TAGGER.tag(style_text(df)),
+    }
+
+
+def compute_user_seq(df):
+    """각 행이 (user_id, date) 정렬에서 몇 번째인지 (df.sort_values(['user_id', 'date']) 와 같은 순서)."""
+    order = np.lexsort((df['date'].to_numpy(), df['user_id'].to_numpy()))
+    seq = np.empty(len(df), dtype=np.int32)
+    seq[order] = np.arange(len(df), dtype=np.int32)
+    return seq
+
+
+def user_date_order(df):
+    """user_seq 컬럼 → (user_id, date) 정렬용 위치 배열. 정렬 없이 O(n) 역순열."""
+    seq = df[SEQ_COLUMN].to_numpy()
+    order = np.empty_like(seq)
+    order[seq] = np.arange(len(seq), dtype=seq.dtype)
+    return order
+
+
+def add_label_columns(df):
+    """고유값 단위로 만드는 라벨 컬럼(product / skin_type)을 붙인다. 캐시 없이도 충분히 빠름."""
+    return add_skin_column(add_product_column(df))
+
+
+def _read(path):
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    out = {}
+    for name in table.column_names:
+        col = table.column(name)
+        arr = col.chunk(0) if col.num_chunks == 1 else col.combine_chunks()
+        out[name] = arr.to_numpy(zero_copy_only=False)  # 결측 없는 숫자 컬럼은 mmap 페이지를 그대로 참조
+    return out
+
+
+def _write(path, columns):
+    """dict(컬럼 → 배열) 또는 DataFrame 을 무압축 Feather 로 원자적으로 저장."""
+    tmp = path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(columns, preserve_index=False) if isinstance(columns, pd.DataFrame) else pa.table(columns)
+        feather.write_feather(table, tmp, compression='uncompressed')
+        os.replace(tmp, path)
+    except OSError:
+        pass  # 읽기 전용 배포 환경이면 캐시 없이 계속
+
+
+def prune_cache(store, keep, fingerprint, suffix='.feather', prefix=''):
+    """store 에서 현재 데이터/정의와 맞지 않는 예전 캐시 파일 정리 (prefix 로 시작하고 suffix 로 끝나는 것만).
+
+    keep 에 든 이름과 이름에 -{fingerprint}. 가 들어간 파일은 남긴다. 조각별 피처 / load_or_build / sketch 캐시가 같이 쓴다.
+    """
+    try:
+        names = os.listdir(store)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(prefix) and name.endswith(suffix) and name not in keep and f'-{fingerprint}.' not in name:
+            try:
+                os.remove(os.path.join(store, name))
+            except OSError:
+                pass
+
+
+def attach_features(df, data_dir='.'):
+    """로드된 프레임에 파생 피처 컬럼을 붙인다. 디스크에 있으면 읽기만, 없으면 계산 후 저장.
+
+    df 는 load_reviews(data_dir) 를 필터 없이 읽은 것이어야 조각별 캐시와 행이 맞는다.
+    (필터로 행이 빠졌으면 캐시를 건너뛰고 바로 계산)
+    """
+    if df.empty:
+        return df
+
+    parts = find_parts(data_dir)
+    counts = [pq.ParquetFile(p).metadata.num_rows for p in parts]
+    if sum(counts) != len(df):
+        df = df.assign(**compute_row_features(df))
+        df[SEQ_COLUMN] = compute_user_seq(df)
+        return add_label_columns(df)
+
+    store = os.path.join(data_dir, STORE_DIRNAME)
+    defs = definitions_hash()
+    hashes = [file_hash(p) for p in parts]
+    keep = set()
+
+    chunks, offset = {}, 0
+    for part, h, n in zip(parts, hashes, counts):
+        name = f"{os.path.splitext(os.path.basename(part))[0]}-{h}-{defs}.feather"
+        keep.add(name)
+        feats = _read(os.path.join(store, name))
+        if feats is None:
+            feats = compute_row_features(df.iloc[offset:offset + n])
+            _write(os.path.join(store, name), feats)
+        for col, arr in feats.items():
+            chunks.setdefault(col, []).append(arr)
+        offset += n
+
+    for col, arrs in chunks.items():
+        df[col] = arrs[0] if len(arrs) == 1 else np.concatenate(arrs)
+
+    # (user_id, date) 정렬 순서는 user_id 코드가 전체 로드 순서에 의존 → 데이터셋 단위로 저장
+    fingerprint = dataset_fingerprint(parts, hashes)
+    name = f"dataset-{fingerprint}.feather"
+    keep.add(name)
+    seq = _read(os.path.join(store, name))
+    if seq is None:
+        seq = {SEQ_COLUMN: compute_user_seq(df)}
+        _write(os.path.join(store, name), seq)
+    df[SEQ_COLUMN] = seq[SEQ_COLUMN]
+
+    prune_cache(store, keep, fingerprint)
+    # 통합 랭킹용 product / 피부 타입 skin_type 은 고유값에만 규칙을 돌려 캐시 없이도 충분히 빠름
+    return add_label_columns(df)
+
+
+def load_dataset(data_dir='.'):
+    """data_part*.parquet 전체 → 정규화 + 파생 피처까지 붙인 프레임 (.features/frame-<지문>.feather).
+
+    저장된 프레임이 있으면 parquet 디코딩 / 정규화 / 피처 계산 없이 메모리 매핑으로 연다.
+    결측 없는 숫자·날짜 컬럼은 매핑된 페이지를 그대로 참조(읽기 전용)하고, category 컬럼은 코드 배열만 새로 만든다.
+    content 등 문자열 컬럼은 ARROW_STR(Arrow 기반 str)로 변환을 고정해 매핑된 버퍼를 복사 없이 참조한다
+    (object dtype 이면 문자열마다 복사되므로 pandas 옵션에 맡기지 않음). product / skin_type 컬럼은 규칙이 지문에 없어 매번 붙인다.
+    """
+    parts = find_parts(data_dir)
+    if not parts:
+        return pd.DataFrame()
+
+    store = os.path.join(data_dir, STORE_DIRNAME)
+    path = os.path.join(store, f"frame-{dataset_fingerprint(parts)}.feather")
+    try:
+        df = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True, types_mapper=_STRING_TYPES.get)
+    except (OSError, pa.ArrowInvalid):
+        df = None
+    if df is None:
+        # 조각별 피처 캐시(attach_features)가 예전 frame-*.feather 도 같이 정리한다
+        df = attach_features(normalize_frame(load_reviews(data_dir)), data_dir)
+        _write(path, df.drop(columns=[PRODUCT_COLUMN, SKIN_COLUMN], errors='ignore'))
+        return df
+    return add_label_columns(df)
+
+
+def _load_pickle(path):
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def _object_stamp(fingerprint, params):
+    """데이터셋 지문 + 분석 객체 설정(params) → 파일 이름용 해시."""
+    return _digest(json.dumps({'data': fingerprint, 'params': params}, ensure_ascii=False, sort_keys=True).encode())
+
+
+def load_or_build(kind, df, build, data_dir='.', extend=None, params=None):
+    """데이터셋 단위 분석 객체를 .features/<kind>-<스탬프>.pkl 에서 읽거나, 없으면 만들어 저장.
+
+    스탬프 = 데이터셋 지문 + params(만드는 쪽의 설정과 코드 버전 상수, JSON 으로 직렬화 가능한 dict) 해시.
+    임계값이나 계산 코드가 바뀌어 params 가 달라지면 예전 객체를 쓰지 않고 다시 만든다.
+    - 지금 조각 전체에 대한 객체가 있으면 그대로 읽음
+    - extend 가 있고 앞쪽 조각들(prefix)로 같은 params 로 만든 객체가 있으면 extend(obj, df, prefix 행 수) 로 새 조각만 반영
+    - 둘 다 없으면 build(df)
+    필터로 일부만 읽은 df 면 디스크 캐시 없이 바로 build(df).
+    """
+    parts = find_parts(data_dir)
+    counts = [pq.ParquetFile(p).metadata.num_rows for p in parts]
+    if df.empty or not parts or sum(counts) != len(df):
+        return build(df)
+
+    store = os.path.join(data_dir, STORE_DIRNAME)
+    hashes = [file_hash(p) for p in parts]
+    stamp = _object_stamp(dataset_fingerprint(parts, hashes), params)
+    path = os.path.join(store, f"{kind}-{stamp}.pkl")
+    obj = _load_pickle(path)
+    if obj is not None:
+        return obj
+
+    if extend is not None:
+        for k in range(len(parts) - 1, 0, -1):
+            old_stamp = _object_stamp(dataset_fingerprint(parts[:k], hashes[:k]), params)
+            old = _load_pickle(os.path.join(store, f"{kind}-{old_stamp}.pkl"))
+            if old is not None:
+                obj = extend(old, df, sum(counts[:k]))
+                break
+    if obj is None:
+        obj = build(df)
+
+    tmp = path + '.tmp'
+    try:
+        os.makedirs(store, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        return obj  # 저장 못 했으면 예전 객체도 남겨 둔다
+    prune_cache(store, set(), stamp, suffix='.pkl', prefix=f'{kind}-')
+    return obj
@@ -0,0 +1,119 @@
+"""새 리뷰/구매 조각 증분 적재.
+
+크롤러가 매일 떨구는 parquet 파일을 다음 번호의 data_partN.parquet 로 붙인다.
+- 기존 조각과 같은 스키마로 맞춘다 (없는 컬럼은 결측, 모르는 컬럼은 버림)
+- (user_id, goods_name, date) 가 기존 데이터나 같은 파일 안에 이미 있으면 버린다
+- 적재 후 파생 피처/집계 캐시를 데워 둔다: 조각별 피처는 새 조각만, 전이 인덱스/집계는 extend 로 새 행만 계산,
+  전체 프레임(frame-<지문>.feather)은 새로 써서 앱이 메모리 매핑으로 바로 연다,
+  헤더 KPI 용 조각 요약(stats-*.pkl, roundlab.sketch)도 새 조각 것만 계산
+
+    python -m roundlab.ingest new_reviews.parquet [--data-dir .] [--no-warm]
+"""
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from roundlab.loader import find_parts
+
+DEDUP_KEY = ['user_id', 'goods_name', 'date']
+
+
+def row_keys(table):
+    """(user_id, goods_name, date) 행 키의 64비트 해시 (문자열/날짜 표현 차이는 정규화)."""
+    frame = table.select(DEDUP_KEY).to_pandas()
+    norm = pd.DataFrame({
+        'user_id': frame['user_id'].astype(object).where(frame['user_id'].notna(), '').astype(str),
+        'goods_name': frame['goods_name'].astype(object).where(frame['goods_name'].notna(), '').astype(str),
+        'date': pd.to_datetime(frame['date'], errors='coerce').astype('datetime64[ns]'),
+    })
+    return pd.util.hash_pandas_object(norm, index=False).to_numpy()
+
+
+def align_schema(table, schema):
+    """table 을 기존 조각 schema 의 컬럼 순서/타입으로 맞춘다."""
+    columns = []
+    for field in schema:
+        if field.name in table.column_names:
+            try:
+                columns.append(table.column(field.name).cast(field.type))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise ValueError(f"'{field.name}' 컬럼을 기존 타입({field.type})으로 바꿀 수 없습니다: {e}") from e
+        else:
+            columns.append(pa.nulls(len(table), type=field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def next_part_path(data_dir='.'):
+    numbers = [int(re.search(r'data_part(\d+)\.parquet$', p).group(1)) for p in find_parts(data_dir)]
+    return os.path.join(data_dir, f"data_part{max(numbers, default=0) + 1}.parquet")
+
+
+def ingest(paths, data_dir='.'):
+    """새 parquet 파일(들)을 중복 제거 후 조각 하나로 추가. 반환: 적재 요약 dict."""
+    parts = find_parts(data_dir)
+    new = pa.concat_tables([pq.read_table(p) for p in paths], promote_options='permissive')
+    missing = [c for c in DEDUP_KEY if c not in new.column_names]
+    if missing:
+        raise ValueError(f"중복 판단 컬럼이 없습니다: {missing}")
+
+    if parts:
+        new = align_schema(new, pq.read_schema(parts[0]))
+        seen = row_keys(ds.dataset(parts, format='parquet').to_table(columns=DEDUP_KEY, use_threads=True))
+    else:
+        seen = np.zeros(0, dtype=np.uint64)
+
+    keys = row_keys(new)
+    _, first = np.unique(keys, return_index=True)
+    keep = np.zeros(len(keys), dtype=bool)
+    keep[first] = True                   # 같은 파일 안 중복은 처음 것만
+    keep &= ~np.isin(keys, seen)         # 이미 적재된 행 제외
+    new = new.filter(pa.array(keep))
+
+    summary = {'read': len(keys), 'duplicates': int(len(keys) - keep.sum()), 'appended': new.num_rows, 'path': None}
+    if new.num_rows == 0:
+        return summary
+
+    path = next_part_path(data_dir)
+    tmp = path + '.tmp'
+    pq.write_table(new, tmp)
+    os.replace(tmp, path)  # 쓰는 도중의 파일이 data_part*.parquet 로 잡히지 않게
+    summary['path'] = path
+    return summary
+
+
+def warm(data_dir='.'):
+    """적재 후 대시보드가 쓰는 디스크 캐시를 미리 갱신 (앱 첫 로드 때 계산하지 않도록)."""
+    from roundlab.aggregates import AGGREGATE_PARAMS, DatasetAggregates
+    from roundlab.feature_store import load_dataset, load_or_build
+    from roundlab.sketch import dataset_stats
+    from roundlab.transitions import TRANSITION_PARAMS, TransitionIndex
+
+    df = load_dataset(data_dir)
+    load_or_build('transitions', df, TransitionIndex, data_dir, extend=TransitionIndex.extend, params=TRANSITION_PARAMS)
+    load_or_build('aggregates', df, DatasetAggregates, data_dir, extend=DatasetAggregates.extend, params=AGGREGATE_PARAMS)
+    dataset_stats(data_dir)  # 헤더 KPI 용 조각 요약 (새 조각만 계산)
+    return len(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='새 리뷰 parquet 파일을 data_partN.parquet 조각으로 증분 적재')
+    parser.add_argument('paths', nargs='+', help='새로 들어온 parquet 파일')
+    parser.add_argument('--data-dir', default='.', help='data_part*.parquet 가 있는 폴더')
+    parser.add_argument('--no-warm', action='store_true', help='적재 후 캐시 갱신 생략')
+    args = parser.parse_args(argv)
+
+    summary = ingest(args.paths, args.data_dir)
+    print(f"읽음 {summary['read']:,}건 / 중복 {summary['duplicates']:,}건 / 추가 {summary['appended']:,}건"
+          + (f" → {summary['path']}" if summary['path'] else ''))
+    if summary['path'] and not args.no_warm:
+        print(f"캐시 갱신 완료: 전체 {warm(args.data_dir):,}건")
+
+
+if __name__ == '__main__':
+    main()
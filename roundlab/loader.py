@@ -0,0 +1,70 @@
+"""data_part*.parquet 조각들을 하나의 pyarrow 데이터셋으로 읽는 로더."""
+import glob
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+PART_PATTERN = 'data_part*.parquet'
+
+# 대시보드에서 실제로 쓰는 컬럼만 읽는다 (나머지 컬럼은 디스크에서 건너뜀)
+USED_COLUMNS = ['brand', 'goods_name', 'user_id', 'date', 'content', 'option', 'full_name', 'skin_info']
+
+
+def _part_number(path):
+    m = re.search(r'data_part(\d+)\.parquet$', os.path.basename(path))
+    return (int(m.group(1)) if m else float('inf'), path)
+
+
+def find_parts(data_dir='.'):
+    """data_part*.parquet 파일을 번호 순서대로 반환 (data_part10 이 data_part2 뒤에 오도록)."""
+    return sorted(glob.glob(os.path.join(data_dir, PART_PATTERN)), key=_part_number)
+
+
+def dataset_version(data_dir='.'):
+    """조각 파일 목록 + 크기/수정시각. 새 조각이 추가되거나 바뀌면 값이 달라진다 (캐시 키 용도)."""
+    out = []
+    for p in find_parts(data_dir):
+        st = os.stat(p)
+        out.append((os.path.basename(p), st.st_size, st.st_mtime_ns))
+    return tuple(out)
+
+
+def build_filter(date_range=None, brands=None):
+    """날짜 구간(양끝 포함, None 이면 열린 구간)과 브랜드 집합을 pyarrow 필터 식으로 변환."""
+    conds = []
+    if date_range is not None:
+        start, end = date_range
+        if start is not None:
+            conds.append(ds.field('date') >= pa.scalar(pd.Timestamp(start)))
+        if end is not None:
+            conds.append(ds.field('date') <= pa.scalar(pd.Timestamp(end)))
+    if brands is not None:
+        conds.append(ds.field('brand').isin(list(brands)))
+
+    expr = None
+    for cond in conds:
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def load_reviews(data_dir='.', columns=None, date_range=None, brands=None):
+    """조각 파일 전체를 한 번에 읽어 하나의 DataFrame 으로 반환.
+
+    - 파일/row group 단위로 멀티스레드 병렬 읽기 (use_threads)
+    - columns 에 없는 컬럼은 읽지 않음 (기본: USED_COLUMNS)
+    - date_range / brands 조건은 parquet 통계로 row group 을 건너뛰며 읽을 때 적용
+    - pd.concat 없이 Arrow 테이블 하나를 바로 pandas 로 변환 (self_destruct 로 변환 중 메모리 반납)
+    """
+    parts = find_parts(data_dir)
+    if not parts:
+        return pd.DataFrame()
+
+    dataset = ds.dataset(parts, format='parquet')
+    wanted = USED_COLUMNS if columns is None else columns
+    cols = [c for c in wanted if c in dataset.schema.names]
+
+    table = dataset.to_table(columns=cols, filter=build_filter(date_range, brands), use_threads=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
@@ -0,0 +1,183 @@
+"""재구매 다변량 모델 (Proof 탭): 유저 피처 행렬 + L2 정규화 로지스틱 회귀 (NumPy Newton/IRLS).
+
+브랜드마다 그 제품군(product:{브랜드}) 구매 유저를 모아
+- y: 재구매 여부 (Cohorts 의 REPEATERS)
+- X: 패션 취향 태그(무채색 / 기본템), 민감성 피부, 장바구니 크기, 첫 구매가 이 제품인지, 리뷰 길이, 로션 동시 구매
+를 만들고, 계수 → 오즈비(Odds Ratio)와 95% 신뢰구간(Wald)을 돌려준다.
+연속형 피처(장바구니 크기 / 리뷰 길이)는 log1p 후 표준화 → 오즈비는 1 표준편차 증가당 배수.
+피처 행렬은 부모 프로세스에서 벡터 연산으로 만들고, 브랜드별 적합은 일이 충분히 클 때만 프로세스 풀에서 병렬로 돌린다.
+"""
+import numpy as np
+import pandas as pd
+from scipy.special import erfc
+
+from roundlab.brand_index import key_mask
+from roundlab.cohorts import REPEATERS, Cohorts
+from roundlab.constants import TARGETS
+from roundlab.feature_store import SEQ_COLUMN, user_date_order
+from roundlab.parallel import pool_map
+from roundlab.schema import MISSING_USER, contains, text_values
+from roundlab.skin import SKIN_COLUMN
+from roundlab.tagger import STYLE_COLUMN, STYLE_NAMES, user_bits
+
+# 패션 취향 피처 → LIFESTYLE_TAGS 태그 (하나라도 있으면 1)
+STYLE_FEATURES = {
+    '무채색 선호 (Monotone)': ['블랙/무채색 (Monotone)'],
+    '기본템 선호 (Basic)': ['상의 (Basic/T-shirt)', '상의 (Sweat/Hoodie)'],
+}
+FACTORS = list(STYLE_FEATURES) + ['민감성 피부 (Sensitive)', '장바구니 크기', '첫 구매 = 이 제품', '리뷰 길이', '로션 합배송']
+CONTINUOUS = ['장바구니 크기', '리뷰 길이']
+Z95 = 1.959963984540054
+L2 = 1.0
+MODEL_VERSION = 1  # 피처 / 적합 로직을 바꾸면 올려서 .features/ 의 예전 repurchase_model-*.pkl 을 무효화
+PARALLEL_MIN_WORK = 10**8  # 유저 수 × 피처 수 합이 이보다 작으면 풀 없이 (spawn 기동이 적합보다 수십 배 느림)
+
+
+def _any_by_user(idx, mask, n_users):
+    return (np.bincount(idx[mask], minlength=n_users) > 0).astype(np.float64)
+
+
+def common_features(df, n_users):
+    """브랜드와 무관한 유저 피처 / 행 배열 (fit_all 에서 브랜드마다 다시 계산하지 않도록 한 번만)."""
+    idx = df['user_id'].to_numpy().astype(np.int64) + 1
+    common = {'idx': idx}
+
+    fashion = ~key_mask(df, 'beauty')
+    u_bits = user_bits(idx[fashion], df[STYLE_COLUMN].to_numpy()[fashion], n_users)
+    for name, tags in STYLE_FEATURES.items():
+        mask = np.bitwise_or.reduce([1 << STYLE_NAMES.index(t) for t in tags])
+        common[name] = ((u_bits & mask) != 0).astype(np.float64)
+
+    sensitive = contains(df['skin_info'], 'sensitive|민감', case=False) if 'skin_info' in df.columns else np.zeros(len(df), bool)
+    if SKIN_COLUMN in df.columns:
+        sensitive |= (df[SKIN_COLUMN] == '민감성').to_numpy()
+    common['민감성 피부 (Sensitive)'] = _any_by_user(idx, sensitive, n_users)
+
+    # (user_id, date) 정렬에서 유저별 첫 행 위치
+    order = user_date_order(df) if SEQ_COLUMN in df.columns else np.lexsort((df['date'].to_numpy(), idx))
+    common['first_rows'] = order[np.r_[True, idx[order][1:] != idx[order][:-1]]]
+    common['length'] = text_values(df['content']).str.len().to_numpy(dtype=np.float64)
+    common['lotion'] = contains(df['goods_name'], '로션')
+    return common
+
+
+def user_features(df, key, cohorts=None, common=None):
+    """key 구매 유저(user_id 결측 제외)의 (피처 DataFrame, 재구매 여부 y)."""
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    n_users = cohorts.n_users
+    common = common_features(df, n_users) if common is None else common
+    idx = common['idx']
+    k_mask = key_mask(df, key)
+    count = cohorts.counts(key)
+
+    feats = {name: common[name] for name in list(STYLE_FEATURES) + ['민감성 피부 (Sensitive)']}
+
+    # 장바구니 크기: 이 제품군 밖의 구매 건수 (이 제품군 건수는 재구매 여부와 겹치므로 제외)
+    feats['장바구니 크기'] = np.log1p(np.bincount(idx[~k_mask], minlength=n_users).astype(np.float64))
+
+    # 첫 구매: 유저의 (날짜 순) 첫 행이 이 제품군인지
+    first = common['first_rows']
+    first_key = np.zeros(n_users)
+    first_key[idx[first]] = k_mask[first]
+    feats['첫 구매 = 이 제품'] = first_key
+
+    # 리뷰 길이: 이 제품군 리뷰 평균 글자 수
+    total = np.bincount(idx[k_mask], weights=common['length'][k_mask], minlength=n_users)
+    feats['리뷰 길이'] = np.log1p(total / np.maximum(count, 1))
+
+    feats['로션 합배송'] = _any_by_user(idx, common['lotion'] & ~k_mask, n_users)
+
+    users = np.flatnonzero(count > 0)
+    users = users[users != MISSING_USER + 1]
+    X = pd.DataFrame({f: feats[f][users] for f in FACTORS}, index=pd.Index(users - 1, name='user_id'))
+    y = np.isin(cohorts.segments(key)[users], REPEATERS).astype(np.float64)
+    return X, y
+
+
+def standardize(X):
+    """피처 DataFrame → 적합용 배열 (CONTINUOUS 컬럼만 평균 0 / 표준편차 1)."""
+    A = X.to_numpy(dtype=np.float64, copy=True)
+    cont = [FACTORS.index(c) for c in CONTINUOUS]
+    std = A[:, cont].std(axis=0)
+    A[:, cont] = (A[:, cont] - A[:, cont].mean(axis=0)) / np.where(std > 0, std, 1)
+    return A
+
+
+def fit_logistic(X, y, l2=L2, max_iter=50, tol=1e-8):
+    """L2 정규화 로지스틱 회귀 (절편은 정규화 안 함) - Newton/IRLS.
+
+    반환: dict(coef, se, intercept, n, converged). se 는 정규화된 헤시안 역행렬 기준 (Wald).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    A = np.column_stack([np.ones(len(X)), X])
+    penalty = np.full(A.shape[1], l2)
+    penalty[0] = 0
+    beta = np.zeros(A.shape[1])
+    converged = False
+    for _ in range(max_iter):
+        p = 1 / (1 + np.exp(-np.clip(A @ beta, -30, 30)))
+        w = p * (1 - p)
+        H = (A * w[:, None]).T @ A + np.diag(penalty)
+        g = A.T @ (y - p) - penalty * beta
+        step = np.linalg.solve(H, g)
+        beta += step
+        if np.max(np.abs(step)) < tol:
+            converged = True
+            break
+    p = 1 / (1 + np.exp(-np.clip(A @ beta, -30, 30)))
+    H = (A * (p * (1 - p))[:, None]).T @ A + np.diag(penalty)
+    se = np.sqrt(np.diag(np.linalg.pinv(H)))
+    return {'coef': beta[1:], 'se': se[1:], 'intercept': beta[0], 'n': len(y), 'converged': converged}
+
+
+def _fit_job(args):
+    """프로세스 풀 작업 단위 (모듈 최상위 함수여야 pickle 가능)."""
+    X, y, l2 = args
+    return fit_logistic(X, y, l2)
+
+
+def odds_table(brand, fit, y):
+    """적합 결과 → Factor / Odds Ratio / CI / p / Impact 표 (Odds Ratio 큰 순)."""
+    coef, se = fit['coef'], fit['se']
+    z = np.divide(coef, se, out=np.zeros_like(coef), where=se > 0)
+    table = pd.DataFrame({
+        'Brand': brand,
+        'Factor': FACTORS,
+        'Coef': coef,
+        'Odds Ratio': np.exp(coef),
+        'CI Low': np.exp(coef - Z95 * se),
+        'CI High': np.exp(coef + Z95 * se),
+        'p': erfc(np.abs(z) / np.sqrt(2)),
+        'n': fit['n'],
+        'Repurchase(%)': y.mean() * 100 if len(y) else np.nan,
+    })
+    table['Impact'] = np.select([table['CI Low'] > 1, table['CI High'] < 1], ['Positive', 'Negative'], 'Neutral')
+    return table.sort_values('Odds Ratio', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def fit_all(df, brands=None, cohorts=None, l2=L2, processes=None):
+    """brands(기본: TARGETS) 제품군별 재구매 모델 → 오즈비 표 하나 (Brand 컬럼으로 구분).
+
+    processes: 풀 크기 (roundlab.parallel.pool_map, 1 → 순서대로).
+    None 이면 일(유저 수 × 피처 수 합)이 PARALLEL_MIN_WORK 이상일 때만 min(브랜드 수, CPU 수) 풀.
+    """
+    brands = list(TARGETS) if brands is None else list(brands)
+    cohorts = Cohorts(df) if cohorts is None else cohorts
+    common = common_features(df, cohorts.n_users)
+    designs = [user_features(df, f'product:{b}', cohorts, common) for b in brands]
+    jobs = [(standardize(X), y, l2) for X, y in designs]
+    if processes is None:
+        work = sum(X.size for X, _, _ in jobs)
+        processes = None if work >= PARALLEL_MIN_WORK else 1
+
+    fits = pool_map(_fit_job, jobs, processes)
+
+    tables = [odds_table(b, fit, y) for b, fit, (_, y) in zip(brands, fits, designs)]
+    return pd.concat(tables, ignore_index=True)
+
+
+def cache_params(cohort_rules, l2=L2):
+    """fit_all(기본 브랜드, Cohorts(**cohort_rules)) 결과의 load_or_build 캐시 키 - 응답(세그먼트 기준) / 피처 정의 / 코드 버전."""
+    return {'version': MODEL_VERSION, 'cohorts': cohort_rules, 'brands': list(TARGETS),
+            'style': STYLE_FEATURES, 'factors': FACTORS, 'l2': l2}
@@ -0,0 +1,97 @@
+"""브랜드 생태계 네트워크: 유저 × 상품 구매 행렬(희소) 곱으로 만든 브랜드-상품 공동구매 그래프."""
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from roundlab.brand_index import key_mask
+from roundlab.constants import TARGETS
+from roundlab.tagger import STYLE_COLUMN
+
+NETWORK_VERSION = 1  # 그래프 계산을 바꾸면 올려서 .features/ 의 예전 network-*.pkl 을 무효화
+ITEM_COLUMN = 'goods_name'
+TOP_K = 5
+NETWORK_PARAMS = {'version': NETWORK_VERSION, 'hubs': list(TARGETS), 'item_col': ITEM_COLUMN, 'top_k': TOP_K}  # load_or_build 캐시 키
+
+
+def incidence(rows, cols, n_rows, n_cols):
+    """(행, 열) 쌍 → 0/1 희소 행렬 (같은 쌍이 여러 번 나와도 1)."""
+    ok = (rows >= 0) & (cols >= 0)
+    mat = sp.csr_matrix((np.ones(ok.sum(), dtype=np.float32), (rows[ok], cols[ok])), shape=(n_rows, n_cols))
+    mat.sum_duplicates()
+    mat.data[:] = 1
+    return mat
+
+
+def _top_k(row, k):
+    """희소 행(1 × n)에서 값이 큰 k 개의 (열, 값)."""
+    if row.nnz == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    k = min(k, row.nnz)
+    top = np.argpartition(-row.data, k - 1)[:k]
+    top = top[np.lexsort((row.indices[top], -row.data[top]))]  # 값 내림차순, 같으면 열 번호 순
+    return row.indices[top], row.data[top]
+
+
+def copurchase_graph(df, hubs=None, item_col=ITEM_COLUMN, top_k=TOP_K):
+    """허브 브랜드(TARGETS) ↔ 상품 공동구매 그래프.
+
+    - X: 유저 × 상품 구매 여부 (희소), H: 유저 × 허브 브랜드 구매 여부 (희소)
+    - 허브-상품 가중치 = Hᵀ·X (그 브랜드 구매자 중 해당 상품도 산 유저 수), 허브마다 상위 top_k 만 남김
+    - 허브-허브 가중치 = Hᵀ·H (두 브랜드를 모두 산 유저 수)
+    밀집 행렬은 만들지 않으므로 전체 상품 카탈로그(13만 개 이상)에도 그대로 쓸 수 있다.
+
+    반환: (nodes, edges)
+    - nodes: node / kind('hub'|'item') / weight / brand(상품이 속한 허브, 없으면 '') / is_fashion
+    - edges: source / target / weight / kind('hub-item'|'hub-hub')
+    """
+    hubs = list(TARGETS) if hubs is None else list(hubs)
+    users = df['user_id'].to_numpy()
+    n_users = int(users.max()) + 1 if len(users) else 0
+    items = df[item_col].cat.codes.to_numpy()
+    item_names = df[item_col].cat.categories
+
+    X = incidence(users, items, n_users, len(item_names))
+    h_rows, h_cols = [np.zeros(0, dtype=users.dtype)], [np.zeros(0, dtype=np.int64)]
+    item_hub = np.full(len(item_names), '', dtype=object)  # 상품이 속한 허브 브랜드 (앞 순서 우선)
+    for j, hub in reversed(list(enumerate(hubs))):
+        m = key_mask(df, f'brand:{hub}')
+        h_rows.append(users[m])
+        h_cols.append(np.full(m.sum(), j, dtype=np.int64))
+        item_hub[np.unique(items[m & (items >= 0)])] = hub
+    H = incidence(np.concatenate(h_rows), np.concatenate(h_cols), n_users, len(hubs))
+
+    W = (H.T @ X).tocsr()   # 허브 × 상품
+    HH = (H.T @ H).toarray()  # 허브 × 허브 (허브 수만큼이라 작음)
+
+    # 패션/잡화 상품 여부 (뷰티 브랜드가 아니면서 라이프스타일 태그가 하나라도 걸린 상품)
+    style = np.zeros(len(item_names), dtype=bool)
+    tagged = (df[STYLE_COLUMN].to_numpy() != 0) & ~key_mask(df, 'beauty') & (items >= 0)
+    style[np.unique(items[tagged])] = True
+
+    edge_rows, item_weight = [], {}
+    for i, hub in enumerate(hubs):
+        cols, vals = _top_k(W[i], top_k)
+        for c, v in zip(cols, vals):
+            edge_rows.append((hub, item_names[c], float(v), 'hub-item'))
+            item_weight[c] = max(item_weight.get(c, 0.0), float(v))
+        for j in range(i + 1, len(hubs)):
+            if HH[i, j] > 0:
+                edge_rows.append((hub, hubs[j], float(HH[i, j]), 'hub-hub'))
+    edges = pd.DataFrame(edge_rows, columns=['source', 'target', 'weight', 'kind'])
+
+    node_rows = [(hub, 'hub', float(HH[i, i]), hub, False) for i, hub in enumerate(hubs)]
+    node_rows += [(item_names[c], 'item', w, item_hub[c], bool(style[c])) for c, w in sorted(item_weight.items())]
+    nodes = pd.DataFrame(node_rows, columns=['node', 'kind', 'weight', 'brand', 'is_fashion'])
+    nodes = nodes.drop_duplicates('node')  # 허브 이름과 같은 상품명이 있으면 허브 쪽을 남김
+    return nodes, edges
+
+
+def spring_positions(nodes, edges, k=2.5, seed=42):
+    """노드 목록 + 간선 목록 [(source, target, weight), ...] → {node: (x, y)}. 같은 그래프면 항상 같은 배치."""
+    G = nx.Graph()
+    G.add_nodes_from(sorted(nodes))
+    for u, v, w in sorted(edges):
+        G.add_edge(u, v, weight=w)
+    pos = nx.spring_layout(G, k=k, seed=seed)
+    return {n: (float(x), float(y)) for n, (x, y) in pos.items()}
@@ -0,0 +1,24 @@
+"""CPU 작업을 프로세스 풀로 나눠 돌리는 공용 헬퍼 (재구매 모델 / 부트스트랩)."""
+import concurrent.futures
+import multiprocessing
+import os
+
+
+def pool_map(fn, jobs, processes=None):
+    """[fn(job) for job in jobs] 를 프로세스 풀에서 (결과 순서 유지).
+
+    fn 은 모듈 최상위 함수여야 한다 (pickle). processes: 풀 크기
+    (None → min(작업 수, CPU 수), 1 → 현재 프로세스에서 순서대로).
+    풀을 못 띄우는 환경(권한 / 임베디드 인터프리터)이면 순서대로 실행한다.
+    """
+    jobs = list(jobs)
+    processes = min(len(jobs), os.cpu_count() or 1) if processes is None else processes
+    if processes > 1 and len(jobs) > 1:
+        try:
+            # 스레드가 도는 서버(Streamlit) 안에서 fork 하지 않도록 spawn
+            ctx = multiprocessing.get_context('spawn')
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=ctx) as pool:
+                return list(pool.map(fn, jobs))
+        except (OSError, concurrent.futures.process.BrokenProcessPool):
+            pass
+    return [fn(job) for job in jobs]
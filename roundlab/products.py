@@ -0,0 +1,43 @@
+"""상품명 정규화 (통합 랭킹용 canonical product).
+
+PRODUCT_RULES 의 (브랜드 패턴, 상품명 패턴)을 행이 아니라 고유한 (brand, goods_name) 쌍에만 적용하고,
+결과를 category 코드로 펼쳐 product 컬럼을 만든다. 규칙에 안 걸린 상품은 goods_name 그대로.
+"""
+import numpy as np
+import pandas as pd
+
+from roundlab.constants import PRODUCT_RULES
+from roundlab.schema import contains
+
+PRODUCT_COLUMN = 'product'
+
+
+def canonical_products(df, rules=PRODUCT_RULES):
+    """행마다 정규화된 상품 이름 Categorical (goods_name 카테고리 뒤에 규칙 이름이 붙는 순서)."""
+    goods = df['goods_name'].cat.categories
+    n_goods = len(goods)
+    b = df['brand'].cat.codes.to_numpy().astype(np.int64)
+    g = df['goods_name'].cat.codes.to_numpy().astype(np.int64)
+
+    # 고유 (brand, goods) 쌍 (-1 결측 코드는 +1 로 밀어서 키에 포함)
+    pair_codes, pairs = pd.factorize((b + 1) * (n_goods + 1) + (g + 1), sort=False)
+    pair_b, pair_g = pairs // (n_goods + 1) - 1, pairs % (n_goods + 1) - 1
+    pair_brand = pd.Series(pd.Categorical.from_codes(pair_b, df['brand'].cat.categories))
+    pair_goods = pd.Series(pd.Categorical.from_codes(pair_g, goods))
+
+    names = [name for name in rules if name not in goods]
+    categories = goods.append(pd.Index(names, dtype=goods.dtype))
+    out = pair_g.copy()
+    for name, rule in rules.items():  # 뒤쪽 규칙이 덮어씀
+        hit = contains(pair_brand, rule['brand_kw']) & contains(pair_goods, rule['goods_kw'])
+        out[hit] = categories.get_loc(name)
+
+    codes = out[pair_codes].astype(np.int32 if len(categories) < 2 ** 31 else np.int64)
+    return pd.Categorical.from_codes(codes, categories).remove_unused_categories()
+
+
+def add_product_column(df, rules=PRODUCT_RULES):
+    """df 에 product 컬럼(category)을 붙여 반환."""
+    if not df.empty:
+        df[PRODUCT_COLUMN] = canonical_products(df, rules)
+    return df
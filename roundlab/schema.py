@@ -0,0 +1,59 @@
+"""리뷰 프레임의 메모리 스키마 정규화 + category 컬럼용 패턴 매칭."""
+import numpy as np
+import pandas as pd
+
+# 고유값이 적은 문자열 컬럼 → category (문자열은 고유값 한 번씩만 저장, 행마다 정수 코드)
+CATEGORY_COLUMNS = ['brand', 'goods_name', 'full_name', 'option', 'skin_info']
+# user_id 결측 행의 코드. 실제 유저가 아니므로 유저 단위 집계(구매 횟수 / 세그먼트 / 타임라인)에서는 빼야 한다
+# (원본의 value_counts / groupby 가 NaN 을 버리던 것과 같게). '유저 코드 + 1' 배열에서는 0 번 칸.
+MISSING_USER = -1
+
+
+def normalize_frame(df):
+    """load_reviews() 결과를 압축된 스키마로 변환.
+
+    - CATEGORY_COLUMNS → category
+    - user_id → int32 코드 (첫 등장 순서, 결측은 MISSING_USER)
+    - date → datetime64
+    """
+    if df.empty:
+        return df
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    if 'user_id' in df.columns:
+        codes, _ = pd.factorize(df['user_id'], sort=False)
+        df['user_id'] = np.where(codes < 0, MISSING_USER, codes).astype(np.int32)
+
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+
+    return df
+
+
+def bits_dtype(n):
+    """비트 n 개를 담을 수 있는 가장 작은 부호 없는 정수 dtype."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f'비트가 너무 많습니다: {n}개')
+
+
+def contains(s, pat, case=True, regex=True):
+    """s.astype(str).str.contains(pat, na=False) 와 같은 결과를 bool ndarray 로 반환.
+
+    category 컬럼이면 고유값(categories)에만 패턴을 돌리고 코드로 펼친다 (결측 → False).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = pd.Series(s.cat.categories.astype(str))
+        hit = cats.str.contains(pat, case=case, regex=regex, na=False).to_numpy(dtype=bool)
+        # 코드 -1(결측)은 마지막에 붙인 False 를 가리키게 된다
+        return np.append(hit, False)[s.cat.codes.to_numpy()]
+    return s.astype(str).str.contains(pat, case=case, regex=regex, na=False).to_numpy(dtype=bool)
+
+
+def text_values(s):
+    """category/문자열 컬럼을 결측 → '' 인 문자열 Series 로 (category 의 fillna('') 오류 회피)."""
+    return s.astype(object).fillna('').astype(str)
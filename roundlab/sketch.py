@@ -0,0 +1,181 @@
+"""조각(data_part*.parquet)별 요약 통계 + HyperLogLog 스케치 (헤더 KPI 용).
+
+조각마다 한 번만 계산해 .features/stats-<조각>-<해시>.pkl 로 저장한다.
+- 행 수 / 날짜 최소·최대 / 가격 매칭 행 수 (price 컬럼이 있을 때만)
+- 고유 유저 / 고유 상품(full_name) 수: HyperLogLog (레지스터 2^14 개 = 16KB, 상대 오차 약 0.8%)
+HLL 은 레지스터별 max 로 합쳐지므로 데이터셋 전체 KPI = 조각 요약을 합치기만 하면 된다 (마이크로초 단위).
+새 조각이 적재되면 그 조각의 요약만 새로 계산한다.
+"""
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from roundlab.feature_store import STORE_DIRNAME, dataset_fingerprint, file_hash, prune_cache
+from roundlab.loader import find_parts
+
+HLL_P = 14
+PRICE_COLUMN = 'price'
+STATS_VERSION = 1  # 요약 로직을 바꾸면 올려서 기존 캐시를 무효화
+
+
+def _hash(values):
+    """값 배열 → 고유값별 64비트 해시 (프로세스 / 재시작과 무관한 고정 키, 결측 제외).
+
+    HLL 은 같은 값을 여러 번 넣어도 결과가 같으므로 고유값만 해시한다.
+    """
+    uniques = pd.Series(pd.Series(values).dropna().unique()).astype(str)
+    return pd.util.hash_array(uniques.to_numpy(dtype=object))
+
+
+def _leading_zeros(w):
+    """uint64 배열의 앞쪽 0 비트 수 (32비트 반쪽씩 - float64 로 정확히 표현되는 범위에서 log2)."""
+    hi = (w >> np.uint64(32)).astype(np.float64)
+    lo = (w & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        lz_hi = 31 - np.floor(np.log2(hi))
+        lz_lo = 63 - np.floor(np.log2(lo))
+    return np.where(hi > 0, lz_hi, np.where(lo > 0, lz_lo, 64)).astype(np.int64)
+
+
+class HyperLogLog:
+    """고유값 수 근사 스케치. add(값 배열) 로 채우고 merge 로 합친 뒤 count()."""
+
+    def __init__(self, p=HLL_P):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add_hashes(self, h):
+        """64비트 해시 배열 반영: 앞 p 비트 = 레지스터 번호, 나머지 비트의 앞쪽 0 개수 + 1 = 순위."""
+        h = np.asarray(h, dtype=np.uint64)
+        if not len(h):
+            return self
+        idx = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        rank = np.minimum(_leading_zeros(h << np.uint64(self.p)), 64 - self.p) + 1
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+        return self
+
+    def add(self, values):
+        return self.add_hashes(_hash(values))
+
+    def merge(self, other):
+        """두 스케치의 합집합 (레지스터별 max, 새 객체)."""
+        if other.p != self.p:
+            raise ValueError(f'정밀도가 다른 스케치는 합칠 수 없습니다: {self.p} != {other.p}')
+        out = HyperLogLog(self.p)
+        np.maximum(self.registers, other.registers, out=out.registers)
+        return out
+
+    def count(self):
+        """고유값 수 추정 (Flajolet et al. 2007, 작은 범위는 linear counting 보정)."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if est <= 2.5 * m and zeros:
+            est = m * np.log(m / zeros)
+        return int(round(est))
+
+
+class PartStats:
+    """조각 하나(또는 여러 조각을 합친 것)의 요약."""
+
+    def __init__(self, rows=0, date_min=None, date_max=None, price_rows=None, users=None, products=None):
+        self.rows = rows
+        self.date_min = date_min
+        self.date_max = date_max
+        self.price_rows = price_rows  # price 컬럼이 없으면 None
+        self.users = users if users is not None else HyperLogLog()
+        self.products = products if products is not None else HyperLogLog()
+
+    @classmethod
+    def from_table(cls, frame):
+        """조각 DataFrame (user_id / full_name / date / price 컬럼) → 요약."""
+        dates = pd.to_datetime(frame['date'], errors='coerce') if 'date' in frame.columns else pd.Series(pd.NaT, index=frame.index)
+        if 'full_name' in frame.columns:
+            products = frame['full_name']
+        else:
+            products = frame['brand'].astype(str) + ' ' + frame['goods_name'].astype(str)
+        return cls(
+            rows=len(frame),
+            date_min=dates.min() if dates.notna().any() else None,
+            date_max=dates.max() if dates.notna().any() else None,
+            price_rows=int(frame[PRICE_COLUMN].notna().sum()) if PRICE_COLUMN in frame.columns else None,
+            users=HyperLogLog().add(frame['user_id']),
+            products=HyperLogLog().add(products),
+        )
+
+    def merge(self, other):
+        def pick(fn, a, b):
+            return b if a is None else a if b is None else fn(a, b)
+        return PartStats(
+            rows=self.rows + other.rows,
+            date_min=pick(min, self.date_min, other.date_min),
+            date_max=pick(max, self.date_max, other.date_max),
+            price_rows=pick(lambda a, b: a + b, self.price_rows, other.price_rows),
+            users=self.users.merge(other.users),
+            products=self.products.merge(other.products),
+        )
+
+    def kpis(self):
+        """헤더 KPI dict (price 컬럼이 없으면 price_matched / coverage 는 None)."""
+        coverage = None if self.price_rows is None else self.price_rows / max(self.rows, 1) * 100
+        return {
+            'unique_users': self.users.count(),
+            'rows': self.rows,
+            'products': self.products.count(),
+            'price_matched': self.price_rows,
+            'coverage': coverage,
+            'date_min': self.date_min,
+            'date_max': self.date_max,
+        }
+
+
+def _stats_columns(path):
+    names = pq.read_schema(path).names
+    return [c for c in ['user_id', 'full_name', 'brand', 'goods_name', 'date', PRICE_COLUMN] if c in names]
+
+
+def _stats_name(path, h):
+    return f"stats-{os.path.splitext(os.path.basename(path))[0]}-{h}-v{STATS_VERSION}.pkl"
+
+
+def part_stats(path, store=None):
+    """조각 파일 하나의 요약. store 가 있으면 .features/stats-<조각>-<해시>.pkl 에서 읽거나 계산 후 저장."""
+    cache = None
+    if store is not None:
+        cache = os.path.join(store, _stats_name(path, file_hash(path)))
+        try:
+            with open(cache, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+    stats = PartStats.from_table(pq.read_table(path, columns=_stats_columns(path)).to_pandas())
+    if cache is not None:
+        tmp = cache + '.tmp'
+        try:
+            os.makedirs(store, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump(stats, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache)
+        except OSError:
+            pass  # 읽기 전용 배포 환경이면 캐시 없이 계속
+    return stats
+
+
+def dataset_stats(data_dir='.'):
+    """data_part*.parquet 전체 요약 = 조각별 요약의 합 (조각 요약은 디스크 캐시, 없는 조각만 계산)."""
+    parts = find_parts(data_dir)
+    store = os.path.join(data_dir, STORE_DIRNAME)
+    total = PartStats()
+    for path in parts:
+        total = total.merge(part_stats(path, store))
+    if parts:
+        # 내용이 바뀌었거나 지워진 조각의 예전 요약 정리
+        hashes = [file_hash(p) for p in parts]
+        keep = {_stats_name(p, h) for p, h in zip(parts, hashes)}
+        prune_cache(store, keep, dataset_fingerprint(parts, hashes), suffix='.pkl', prefix='stats-')
+    return total
@@ -0,0 +1,38 @@
+"""피부 타입 정규화 (skin_info 원문 → 건성 / 지성 / 복합성 / 민감성 / 기타).
+
+skin_info 는 category 컬럼이라 고유값(categories)에만 parse_skin_info 를 돌리고
+코드로 펼쳐 skin_type 컬럼(고정 카테고리 SKIN_TYPES)을 만든다. 행 단위 문자열 처리 없음.
+"""
+import numpy as np
+import pandas as pd
+
+SKIN_COLUMN = 'skin_type'
+SKIN_TYPES = ['건성', '지성', '복합성', '민감성', '기타']
+
+
+def parse_skin_info(text):
+    """skin_info 원문 → 건성 / 지성 / 복합성 / 민감성 / 기타 (결측은 None)."""
+    if pd.isna(text): return None
+    text = text.lower()
+    if 'dry' in text: return '건성'
+    if 'oily' in text: return '지성'
+    if 'combination' in text: return '복합성'
+    if 'sensitive' in text: return '민감성'
+    return '기타'
+
+
+def skin_types(s):
+    """skin_info Series → 피부 타입 Categorical (결측 / 파싱 불가는 NaN)."""
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype('category')
+    parsed = [parse_skin_info(v) for v in s.cat.categories]
+    lookup = np.array([SKIN_TYPES.index(p) if p is not None else -1 for p in parsed] + [-1], dtype=np.int8)
+    # 코드 -1(결측)은 마지막에 붙인 -1 을 가리키게 된다
+    return pd.Categorical.from_codes(lookup[s.cat.codes.to_numpy()], categories=SKIN_TYPES)
+
+
+def add_skin_column(df):
+    """df 에 skin_type 컬럼(category)을 붙여 반환 (skin_info 가 없으면 그대로)."""
+    if not df.empty and 'skin_info' in df.columns:
+        df[SKIN_COLUMN] = skin_types(df['skin_info'])
+    return df
@@ -0,0 +1,270 @@
+"""대시보드 스냅샷: 모든 분석 × 위젯 옵션 결과를 오프라인으로 미리 계산해 파일 하나로 저장.
+
+배포 후 첫 사용자가 load_data() / 캐시 함수 워밍업을 기다리지 않도록,
+앱의 캐시 함수 이름(get_market_share 등) × 인자 조합마다 결과를 계산해 zip 하나에 담는다.
+- manifest.json: 포맷 버전 / 데이터셋 지문 / 분석 정의 해시 / 코드 해시 / 생성 시각 / 항목(이름 + 인자 → 저장 위치·타입)
+- DataFrame / Series → parquet (zstd), ndarray → npy, dict / tuple / 스칼라 → manifest 안에 재귀로
+앱은 시작할 때 스냅샷을 열고 조회만 하며, 스냅샷에 없는 조합은 기존처럼 실시간 계산한다.
+데이터 조각 / 분석 정의(constants, 캐시 객체 설정) / roundlab 코드 중 하나라도 만들 때와 다르면
+스냅샷을 버린다 (로그를 남기고 전부 실시간 계산).
+
+    python -m roundlab.snapshot [--data-dir .] [--out dashboard_snapshot.zip]
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from roundlab import bootstrap, constants, engine, model
+from roundlab.aggregates import AGGREGATE_PARAMS, DatasetAggregates
+from roundlab.basket import BasketIndex
+from roundlab.brand_index import key_mask
+from roundlab.cadence import user_cadence
+from roundlab.cohorts import LOYAL, ONE_TIME, Cohorts
+from roundlab.constants import COHORT_RULES, TARGETS
+from roundlab.feature_store import dataset_fingerprint, load_dataset, load_or_build
+from roundlab.loader import find_parts
+from roundlab.network import NETWORK_PARAMS, copurchase_graph, spring_positions
+from roundlab.terms import METHODS, TERM_PARAMS, TermIndex
+from roundlab.transitions import TRANSITION_PARAMS, TransitionIndex
+
+FORMAT_VERSION = 1
+SNAPSHOT_NAME = 'dashboard_snapshot.zip'
+MANIFEST = 'manifest.json'
+CONTRAST_PAIRS = [(ONE_TIME, (LOYAL,)), ((LOYAL,), ONE_TIME)]  # 이탈자 vs 찐팬 / 찐팬 vs 이탈자
+FLOW_TOP = 10  # 유입/이탈 브랜드마다 상세 제품을 미리 계산할 상위 브랜드 수
+
+logger = logging.getLogger(__name__)
+
+
+def definitions_hash():
+    """스냅샷 값이 기대는 분석 정의의 해시 (constants 의 대문자 상수 전부 + 디스크 캐시 객체 설정)."""
+    payload = {name: value for name, value in vars(constants).items() if name.isupper()}
+    payload['objects'] = [AGGREGATE_PARAMS, TRANSITION_PARAMS, NETWORK_PARAMS, TERM_PARAMS,
+                          model.cache_params(COHORT_RULES)]
+    return hashlib.blake2b(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode(),
+                           digest_size=8).hexdigest()
+
+
+def code_hash():
+    """roundlab 패키지 소스(.py) 전체의 해시 - 분석 코드가 바뀐 배포면 달라진다."""
+    h = hashlib.blake2b(digest_size=8)
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package)):
+        if name.endswith('.py'):
+            h.update(name.encode())
+            with open(os.path.join(package, name), 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def entry_key(name, params):
+    """(캐시 함수 이름, df 뒤 인자들) → 항목 키 문자열 (튜플은 리스트로, 앱 / 배치 양쪽 같은 규칙)."""
+    return json.dumps([name, list(params)], ensure_ascii=False, default=str)
+
+
+# -----------------------------------------------------------------------------
+# 값 ↔ zip 멤버 (manifest 노드)
+# -----------------------------------------------------------------------------
+def _encode(value, path, zf):
+    if isinstance(value, pd.DataFrame):
+        buf = io.BytesIO()
+        value.to_parquet(buf, compression='zstd')
+        zf.writestr(path + '.parquet', buf.getvalue())
+        return {'type': 'frame', 'path': path + '.parquet'}
+    if isinstance(value, pd.Series):
+        node = _encode(value.to_frame('value'), path, zf)
+        return {**node, 'type': 'series', 'name': value.name}
+    if isinstance(value, np.ndarray):
+        buf = io.BytesIO()
+        np.save(buf, value, allow_pickle=False)
+        zf.writestr(path + '.npy', buf.getvalue())
+        return {'type': 'array', 'path': path + '.npy'}
+    if isinstance(value, dict):
+        return {'type': 'dict', 'items': [[k, _encode(v, f'{path}.{i}', zf)] for i, (k, v) in enumerate(value.items())]}
+    if isinstance(value, (tuple, list)):
+        return {'type': type(value).__name__, 'items': [_encode(v, f'{path}.{i}', zf) for i, v in enumerate(value)]}
+    if isinstance(value, np.generic):
+        value = value.item()
+    return {'type': 'json', 'value': value}
+
+
+def _decode(node, zf):
+    kind = node['type']
+    if kind in ('frame', 'series'):
+        frame = pd.read_parquet(io.BytesIO(zf.read(node['path'])))
+        return frame['value'].rename(node['name']) if kind == 'series' else frame
+    if kind == 'array':
+        return np.load(io.BytesIO(zf.read(node['path'])), allow_pickle=False)
+    if kind == 'dict':
+        return {k: _decode(v, zf) for k, v in node['items']}
+    if kind in ('tuple', 'list'):
+        items = [_decode(v, zf) for v in node['items']]
+        return tuple(items) if kind == 'tuple' else items
+    return node['value']
+
+
+class Snapshot:
+    """열린 스냅샷 파일 (항목 키 → 값 조회). 조회마다 멤버를 새로 읽어 호출자끼리 객체를 공유하지 않는다."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._zf = zipfile.ZipFile(io.BytesIO(f.read()))
+        self.manifest = json.loads(self._zf.read(MANIFEST))
+        self._lock = threading.Lock()  # ZipFile 은 스레드(세션) 간 동시 읽기에 안전하지 않음
+
+    def __contains__(self, key):
+        return key in self.manifest['entries']
+
+    def __len__(self):
+        return len(self.manifest['entries'])
+
+    def get(self, key):
+        with self._lock:
+            return _decode(self.manifest['entries'][key], self._zf)
+
+
+def open_snapshot(path=None, data_dir='.'):
+    """스냅샷을 열어 반환. 파일이 없거나 포맷 버전 / 데이터셋 지문 / 분석 정의 / 코드가 지금과 다르면 None (→ 실시간 계산)."""
+    path = os.path.join(data_dir, SNAPSHOT_NAME) if path is None else path
+    parts = find_parts(data_dir)
+    if not parts or not os.path.exists(path):
+        return None
+    try:
+        snap = Snapshot(path)
+    except (OSError, zipfile.BadZipFile, KeyError, ValueError) as e:
+        logger.warning('스냅샷 %s 를 열 수 없어 실시간 계산합니다: %s', path, e)
+        return None
+    meta = snap.manifest
+    current = {'format': FORMAT_VERSION, 'fingerprint': dataset_fingerprint(parts),
+               'definitions': definitions_hash(), 'code': code_hash()}
+    stale = [k for k, v in current.items() if meta.get(k) != v]
+    if stale:
+        logger.warning('스냅샷 %s 이 지금과 달라(%s) 쓰지 않습니다 - python -m roundlab.snapshot 으로 다시 만드세요',
+                    path, ', '.join(stale))
+        return None
+    return snap
+
+
+# -----------------------------------------------------------------------------
+# 배치: 앱 캐시 함수 이름 → (인자 조합 목록, 계산 함수)
+# -----------------------------------------------------------------------------
+class Context:
+    """배치 입력 (앱과 같은 df / 디스크 캐시 집계 / COHORT_RULES 코호트)."""
+
+    def __init__(self, data_dir='.'):
+        self.df = load_dataset(data_dir)
+        self.agg = load_or_build('aggregates', self.df, DatasetAggregates, data_dir,
+                                 extend=DatasetAggregates.extend, params=AGGREGATE_PARAMS)
+        self.cohorts = Cohorts(self.df, self.agg, **COHORT_RULES)
+        self.transitions = load_or_build('transitions', self.df, TransitionIndex, data_dir,
+                                         extend=TransitionIndex.extend, params=TRANSITION_PARAMS)
+        self.terms = load_or_build('terms', self.df, TermIndex, data_dir, params=TERM_PARAMS)
+        self.network = load_or_build('network', self.df, copurchase_graph, data_dir, params=NETWORK_PARAMS)
+        self.model = load_or_build('repurchase_model', self.df, lambda d: model.fit_all(d, cohorts=self.cohorts),
+                                   data_dir, params=model.cache_params(COHORT_RULES))
+        self.basket = BasketIndex(self.df)
+
+
+def _flow_counts(c, direction, key):
+    t = c.transitions
+    return t.inflow_counts(key) if direction == 'inflow' else t.outflow_counts(key)
+
+
+def _flow_detail(c, direction, key, brand):
+    t = c.transitions
+    return t.inflow_detail(key, brand) if direction == 'inflow' else t.outflow_detail(key, brand)
+
+
+def _flow_params(c):
+    """모든 (방향, key) 와 각 상위 FLOW_TOP 브랜드의 상세 조합."""
+    counts, details = [], []
+    for direction, table in [('inflow', c.transitions.inflow), ('outflow', c.transitions.outflow)]:
+        for key in table:
+            counts.append((direction, key))
+            details += [(direction, key, b) for b in _flow_counts(c, direction, key).head(FLOW_TOP).index]
+    return counts, details
+
+
+def _network_view(c):
+    nodes, edges = c.network
+    pos = spring_positions(tuple(nodes['node']), tuple(edges[['source', 'target', 'weight']].itertuples(index=False, name=None)))
+    return nodes, edges, pos
+
+
+# 이름 → (fn(ctx) → 인자 조합 목록, fn(ctx, *인자) → 결과). 이름은 app_deploy.py 의 @snapshotted 함수 이름과 같아야 한다.
+ENTRIES = {
+    'get_product_ranking': (lambda c: [()], lambda c: engine.product_ranking(c.df)),
+    'get_market_share': (lambda c: [(f, v) for f in engine.FREQS.values() for v in engine.SHARE_VIEWS],
+                         lambda c, freq, view: engine.market_share(c.agg, freq=freq, view=view)),
+    'get_flow_counts': (lambda c: _flow_params(c)[0], _flow_counts),
+    'get_flow_detail': (lambda c: _flow_params(c)[1], _flow_detail),
+    'get_network_view': (lambda c: [()], _network_view),
+    'get_repurchase_stats': (lambda c: [()], lambda c: engine.repurchase_stats(c.df, c.cohorts)),
+    'get_repurchase_intervals': (lambda c: [()], lambda c: bootstrap.repurchase_intervals(c.df, cohorts=c.cohorts)),
+    'calculate_lift': (lambda c: [(b,) for b in TARGETS], lambda c, b: engine.attribute_lift(c.df, b, c.cohorts)),
+    'get_lift_intervals': (lambda c: [()], lambda c: bootstrap.lift_intervals(c.df, cohorts=c.cohorts)),
+    'get_frequency_basket': (lambda c: [(b,) for b in TARGETS],
+                             lambda c, b: engine.frequency_basket(c.df, b, c.cohorts, c.basket)),
+    'get_cadence': (lambda c: [('dokdo',)], lambda c, key: user_cadence(c.df, key_mask(c.df, key))),
+    'get_cadence_table': (lambda c: [()], lambda c: engine.cadence_table(c.df)),
+    'get_churn_voice': (lambda c: [()], lambda c: bootstrap.churn_voice_intervals(c.df, cohorts=c.cohorts)),
+    'get_contrast_keywords': (lambda c: [(k, m, a, b) for k in engine.DISCOVERY_KEYS.values() for m in METHODS
+                                         for a, b in CONTRAST_PAIRS],
+                              lambda c, key, method, a, b: engine.contrast_keywords(c.df, c.terms, key, a, b,
+                                                                                    c.cohorts, method)),
+    'get_skin_distribution': (lambda c: [(by,) for by in engine.SKIN_CUTS.values()],
+                              lambda c, by: engine.skin_distribution(c.df, by=by, cohorts=c.cohorts if by == 'cohort' else None)),
+    'analyze_aha_moment': (lambda c: [()], lambda c: engine.aha_moment(c.df, cohorts=c.cohorts)),
+    'get_aha_intervals': (lambda c: [()], lambda c: bootstrap.aha_intervals(c.df, cohorts=c.cohorts)),
+    'get_repurchase_model': (lambda c: [()], lambda c: c.model),
+}
+
+
+def build(data_dir='.', out=None, log=print):
+    """ENTRIES 전부를 계산해 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 교체). 반환: 저장 경로."""
+    parts = find_parts(data_dir)
+    if not parts:
+        raise FileNotFoundError(f'{data_dir} 에 data_part*.parquet 가 없습니다')
+    out = os.path.join(data_dir, SNAPSHOT_NAME) if out is None else out
+
+    t0 = time.perf_counter()
+    ctx = Context(data_dir)
+    log(f"데이터 로드 + 공용 인덱스 {time.perf_counter() - t0:.1f}s ({len(ctx.df):,}행)")
+
+    entries = {}
+    tmp = out + '.tmp'
+    with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for n, (name, (params_fn, fn)) in enumerate(ENTRIES.items()):
+            t = time.perf_counter()
+            combos = params_fn(ctx)
+            for i, params in enumerate(combos):
+                entries[entry_key(name, params)] = _encode(fn(ctx, *params), f'{n:02d}-{name}/{i}', zf)
+            log(f"{name:<26} {len(combos):4d}개  {time.perf_counter() - t:6.2f}s")
+        manifest = {'format': FORMAT_VERSION, 'fingerprint': dataset_fingerprint(parts),
+                    'definitions': definitions_hash(), 'code': code_hash(), 'rows': len(ctx.df),
+                    'created': pd.Timestamp.now().isoformat(timespec='seconds'), 'entries': entries}
+        zf.writestr(MANIFEST, json.dumps(manifest, ensure_ascii=False, default=str))
+    os.replace(tmp, out)
+    log(f"저장: {out} ({os.path.getsize(out) / 1024:.0f}KB, 항목 {len(entries)}개, {time.perf_counter() - t0:.1f}s)")
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='대시보드 분석 결과를 미리 계산해 스냅샷 파일로 저장')
+    parser.add_argument('--data-dir', default='.', help='data_part*.parquet 가 있는 폴더')
+    parser.add_argument('--out', default=None, help=f'저장 경로 (기본: <data-dir>/{SNAPSHOT_NAME})')
+    args = parser.parse_args(argv)
+    build(args.data_dir, args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""합성 리뷰 데이터 생성기 (실데이터와 같은 스키마, 벤치마크/용량 계획용).
+
+brand / goods_name / user_id / date / content / option / full_name / skin_info 컬럼을
+원하는 행 수(10만 ~ 1000만)로 만든다. 문자열은 카탈로그 + 정수 코드로 만들어 Arrow 사전 배열에서
+한 번에 펼치므로 행 단위 Python 루프가 없다.
+
+    python -m roundlab.synthetic 1m --out bench_data --parts 4
+"""
+import argparse
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from roundlab.constants import BEAUTY_KEYWORDS, LIFESTYLE_TAGS, PATTERNS
+
+# 타겟 브랜드 상품 (브랜드/제품군 키워드에 걸리는 것 + 안 걸리는 것)
+TARGET_GOODS = {
+    '라운드랩': ['1025 독도 토너 200ml', '1025 독도 토너 500ml', '1025 독도 로션', '독도 클렌저', '자작나무 수분 크림', '소나무 진정 시카 앰플'],
+    '토리든': ['다이브인 저분자 히알루론산 토너', '다이브인 세럼', '솔리드인 세라마이드 크림'],
+    '에스네이처': ['아쿠아 스쿠알란 수분 토너', '아쿠아 오아시스 스킨', '아쿠아 스쿠알란 수분크림'],
+    '아비브': ['어성초 카밍 토너 스킨 부스터', '어성초 카밍 패드', '부활초 크림'],
+    '토니모리': ['원더 세라마이드 모찌 토너', '모찌 크림', '원더 세라마이드 모찌 에멀전'],
+}
+BEAUTY_GOODS = ['토너', '세럼', '크림', '앰플', '클렌징폼', '선크림', '패드', '로션']
+FASHION_BRANDS = ['무신사스탠다드', '나이키', '커버낫', '디스이즈네버댓', '아디다스', '유니클로', '뉴발란스', '마르디메크르디']
+COLORS = ['블랙', '화이트', '네이비', '그레이', '차콜', '핑크', '블루', '그린', 'BLACK', 'WHITE']
+OTHER_OPTIONS = ['FREE', 'S', 'M', 'L', 'XL', '200ml', '500ml', '1+1 기획', '단품']
+SKIN_INFO = ['dry, sensitive', 'oily', 'combination', 'Dry', 'normal', 'sensitive', 'Oily, trouble', '건성', '지성']
+FILLER = ['좋아요', '재구매 의사 있어요', '배송 빨라요', '그냥 그래요', '향이 좋아요', '포장이 꼼꼼해요', '선물용으로 샀어요',
+          '사이즈 잘 맞아요', '색감이 예뻐요', '생각보다 별로', '가격 대비 괜찮아요', '매일 써요', '두 번째 구매']
+
+SIZES = {'100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+
+def parse_size(text):
+    """'100k' / '1m' / '10m' / '250000' → 행 수."""
+    text = str(text).lower().replace('_', '')
+    if text in SIZES:
+        return SIZES[text]
+    for suffix, mult in (('k', 1_000), ('m', 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * mult)
+    return int(text)
+
+
+def _catalog(rng, n_rows):
+    """(브랜드 목록, 상품 목록, 상품별 브랜드 코드, 브랜드 선택 가중치)."""
+    brands, goods, goods_brand, weight = [], [], [], []
+
+    def add(brand, names, w):
+        brands.append(brand)
+        goods.extend(names)
+        goods_brand.extend([len(brands) - 1] * len(names))
+        weight.append(w)
+
+    for b, names in TARGET_GOODS.items():
+        add(b, names, 6.0 if b == '라운드랩' else 3.0)
+    for b in BEAUTY_KEYWORDS:
+        if b not in TARGET_GOODS:
+            add(b, [f'{b} {g}' for g in BEAUTY_GOODS], 1.5)
+
+    items = [kw for kws in LIFESTYLE_TAGS.values() for kw in kws if not kw.isascii()]
+    for b in FASHION_BRANDS:
+        picks = rng.choice(items, size=12, replace=False)
+        add(b, [f'{b} 베이직 {kw}' for kw in picks], 2.0)
+
+    # 긴 꼬리: 데이터가 커질수록 상품 카탈로그도 커진다 (실데이터는 상품 13만 개 이상)
+    n_tail = max(200, n_rows // 40)
+    per_brand = 25
+    for i in range(n_tail // per_brand):
+        b = f'브랜드{i:05d}'
+        add(b, [f'{b} 상품{j:02d}' for j in range(per_brand)], 8.0 / (i + 8))
+
+    weight = np.asarray(weight)
+    return brands, goods, np.asarray(goods_brand, dtype=np.int32), weight / weight.sum()
+
+
+def _content_pool(rng, size):
+    """리뷰 본문 후보 (속성 키워드 + 일반 문장을 섞은 고유 문장들)."""
+    keywords = [kw.replace('\\', '') for pat in PATTERNS.values() for kw in pat.split('|')]
+    words = np.array(keywords + FILLER * 2, dtype=object)
+    lengths = rng.integers(2, 7, size=size)
+    picks = rng.integers(0, len(words), size=lengths.sum())
+    splits = np.cumsum(lengths)[:-1]
+    return [f'{" ".join(ws)} #{i}' for i, ws in enumerate(np.split(words[picks], splits))]
+
+
+def _dictionary(codes, values):
+    """정수 코드 + 값 목록 → 문자열 Arrow 배열 (코드 -1 은 결측)."""
+    codes = np.asarray(codes, dtype=np.int32)
+    arr = pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), pa.array(values, type=pa.string()))
+    return arr.cast(pa.string())
+
+
+def generate(n_rows, seed=0, start='2024-01-01', days=700):
+    """n_rows 행 합성 리뷰 pyarrow.Table (load_reviews 가 읽는 원본 스키마)."""
+    rng = np.random.default_rng(seed)
+    brands, goods, goods_brand, brand_p = _catalog(rng, n_rows)
+
+    # 유저: 활동량이 한쪽으로 몰린 분포 + 유저마다 선호 브랜드 (재구매 패턴)
+    n_users = max(100, n_rows // 8)
+    activity = rng.pareto(1.5, size=n_users) + 1
+    users = rng.choice(n_users, size=n_rows, p=activity / activity.sum())
+    favorite = rng.choice(len(brands), size=n_users, p=brand_p)
+    brand = np.where(rng.random(n_rows) < 0.4, favorite[users], rng.choice(len(brands), size=n_rows, p=brand_p))
+
+    # 상품: 브랜드 안에서 고르게
+    order = np.argsort(goods_brand, kind='stable')
+    first = np.searchsorted(goods_brand[order], np.arange(len(brands)))
+    count = np.bincount(goods_brand, minlength=len(brands))
+    item = order[first[brand] + (rng.random(n_rows) * count[brand]).astype(np.int64)]
+
+    pool = _content_pool(rng, min(max(n_rows // 3, 1000), 300_000))
+    options = COLORS + OTHER_OPTIONS
+    option = np.where(rng.random(n_rows) < 0.15, -1, rng.integers(0, len(options), size=n_rows))
+    skin = np.where(rng.random(n_rows) < 0.3, -1, rng.integers(0, len(SKIN_INFO), size=n_rows))
+
+    # 날짜: 유저마다 시작일이 다르고 그 뒤로 흩어짐 (ms 단위 timestamp)
+    user_start = rng.integers(0, days, size=n_users)
+    offset = np.minimum(user_start[users] + rng.exponential(90, size=n_rows).astype(np.int64), days - 1)
+    date = np.datetime64(start, 'ms') + offset.astype('timedelta64[D]')
+
+    full_names = [f'{brands[b]} {g}' for b, g in zip(goods_brand, goods)]
+    return pa.table({
+        'brand': _dictionary(goods_brand[item], brands),
+        'goods_name': _dictionary(item, goods),
+        'user_id': _dictionary(users, [f'u{i:07d}' for i in range(n_users)]),
+        'date': pa.array(date.astype('datetime64[ms]')),
+        'content': _dictionary(rng.integers(0, len(pool), size=n_rows), pool),
+        'option': _dictionary(option, options),
+        'full_name': _dictionary(item, full_names),
+        'skin_info': _dictionary(skin, SKIN_INFO),
+    })
+
+
+def write_parts(table, data_dir, n_parts=4):
+    """table 을 data_part1..N.parquet 로 나눠 저장. 반환: 파일 경로 목록."""
+    os.makedirs(data_dir, exist_ok=True)
+    bounds = np.linspace(0, table.num_rows, n_parts + 1).astype(int)
+    paths = []
+    for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:]), 1):
+        path = os.path.join(data_dir, f'data_part{i}.parquet')
+        pq.write_table(table.slice(a, b - a), path)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='합성 리뷰 데이터(data_part*.parquet) 생성')
+    parser.add_argument('size', help='행 수 (100k / 1m / 10m / 숫자)')
+    parser.add_argument('--out', default='.', help='저장 폴더')
+    parser.add_argument('--parts', type=int, default=4, help='조각 파일 수')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = write_parts(generate(parse_size(args.size), seed=args.seed), args.out, args.parts)
+    print(f"{parse_size(args.size):,}행 → {', '.join(paths)}")
+
+
+if __name__ == '__main__':
+    main()
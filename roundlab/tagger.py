@@ -0,0 +1,149 @@
+"""리뷰 속성 태거: 여러 키워드 패턴을 리뷰당 한 번의 스캔으로 비트마스크로 만든다.
+
+패턴이 'a|b|c' 처럼 문자열 alternation 이면 모든 키워드를 긴 것부터 하나의 정규식으로 합쳐
+왼쪽부터 한 번 훑는다. 매치마다
+- 같은 위치에서 맞는 더 짧은 키워드는 반드시 그 키워드의 접두어 → 접두어 키워드들의 비트를 미리 OR
+- 매치 구간 안에서 시작하는 다른 키워드('따가격'의 '가격')는 놓치지 않도록,
+  다음 검색을 매치 끝이 아니라 '다른 키워드가 시작될 수 있는 가장 가까운 위치'부터 재개
+하므로 패턴별 str.contains 를 11번 돌린 것과 결과가 같다.
+정규식 문법이 섞인 패턴만 예외적으로 따로 str.contains 한 번씩 돌린다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from roundlab.constants import LIFESTYLE_TAGS, PATTERNS
+from roundlab.schema import bits_dtype, text_values
+
+ATTR_NAMES = list(PATTERNS)
+ATTR_COLUMN = 'attr_bits'
+
+STYLE_NAMES = list(LIFESTYLE_TAGS)
+STYLE_COLUMN = 'style_bits'
+
+_META = set('.^$*+?{}[]()')
+
+
+def _literals(pattern):
+    """순수 문자열 alternation 이면 키워드 목록, 정규식 문법이 있으면 None."""
+    words, cur, i = [], [], 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                return None  # \s, \d 같은 클래스
+            cur.append(pattern[i + 1])
+            i += 2
+            continue
+        if ch == '|':
+            words.append(''.join(cur))
+            cur = []
+        elif ch in _META:
+            return None
+        else:
+            cur.append(ch)
+        i += 1
+    words.append(''.join(cur))
+    return None if '' in words else words
+
+
+class MultiPatternTagger:
+    """{이름: 패턴} 을 한 번에 검사해 행마다 비트마스크(이름 순서대로 비트 0, 1, ...)를 돌려준다."""
+
+    def __init__(self, patterns):
+        self.names = list(patterns)
+        self.dtype = bits_dtype(len(self.names))
+
+        word_bits = {}
+        self.fallback = []  # (비트, 정규식) - 리터럴로 못 바꾼 패턴
+        for i, pat in enumerate(patterns.values()):
+            words = _literals(pat)
+            if words is None:
+                self.fallback.append((1 << i, pat))
+                continue
+            for w in words:
+                word_bits[w] = word_bits.get(w, 0) | (1 << i)
+
+        # 가장 긴 키워드가 맞았을 때 같은 위치에서 맞는 짧은 키워드(=접두어)의 비트까지 포함
+        self.word_bits = {
+            w: np.bitwise_or.reduce([b for v, b in word_bits.items() if w.startswith(v)])
+            for w in word_bits
+        }
+        words = sorted(word_bits, key=len, reverse=True)
+        # 키워드 w 가 맞은 뒤 다음 검색 시작 오프셋: w 의 접미어가 다른 키워드와 겹칠 수 있는 첫 위치
+        self.skip = {
+            w: next((j for j in range(1, len(w))
+                     if any(w[j:].startswith(v) or v.startswith(w[j:]) for v in words)), len(w))
+            for w in words
+        }
+        self.regex = re.compile('|'.join(map(re.escape, words))) if words else None
+
+    def _tag_one(self, text):
+        bits, pos = 0, 0
+        search, word_bits, skip = self.regex.search, self.word_bits, self.skip
+        while True:
+            m = search(text, pos)
+            if m is None:
+                return bits
+            w = m.group()
+            bits |= word_bits[w]
+            pos = m.start() + skip[w]
+
+    def tag(self, texts):
+        """texts(Series) → 비트마스크 ndarray. 같은 문장은 한 번만 스캔한다 (결측 → 0)."""
+        codes, uniques = pd.factorize(texts.astype(object).fillna(''), sort=False)
+        uniques = [str(t) for t in uniques]
+
+        ubits = np.zeros(len(uniques), dtype=self.dtype)
+        if self.regex is not None:
+            ubits[:] = [self._tag_one(t) if t else 0 for t in uniques]
+        for bit, pat in self.fallback:
+            hit = pd.Series(uniques, dtype=object).str.contains(pat, na=False).to_numpy(dtype=bool)
+            ubits[hit] |= self.dtype(bit)
+        return ubits[codes]
+
+
+ATTR_TAGGER = MultiPatternTagger(PATTERNS)
+STYLE_TAGGER = MultiPatternTagger({k: '|'.join(map(re.escape, v)) for k, v in LIFESTYLE_TAGS.items()})
+
+
+def add_attr_bits(df):
+    """리뷰 content 를 한 번 스캔해 11대 속성 비트(attr_bits, uint16) 컬럼을 붙인다."""
+    if not df.empty:
+        df[ATTR_COLUMN] = ATTR_TAGGER.tag(df['content'])
+    return df
+
+
+def style_text(df):
+    """라이프스타일 태그 매칭용 텍스트 (상품명 + 옵션, 대문자)."""
+    return (text_values(df['goods_name']) + " " + text_values(df['option'])).str.upper()
+
+
+def add_style_bits(df):
+    """상품명+옵션에 대한 LIFESTYLE_TAGS 비트(style_bits) 컬럼을 붙인다."""
+    if not df.empty:
+        df[STYLE_COLUMN] = STYLE_TAGGER.tag(style_text(df))
+    return df
+
+
+def bit_matrix(bits, n):
+    """비트마스크 배열 → (행 × n) 0/1 행렬."""
+    return ((np.asarray(bits)[:, None] >> np.arange(n, dtype=np.asarray(bits).dtype)) & 1).astype(np.uint8)
+
+
+def user_bits(users, bits, n_users):
+    """행 단위 (user 코드, 비트마스크) → 유저별 비트 OR 배열 (길이 n_users, 행이 없는 유저는 0)."""
+    out = np.zeros(n_users, dtype=np.asarray(bits).dtype)
+    np.bitwise_or.at(out, users, bits)
+    return out
+
+
+def attr_rates(bits, names=ATTR_NAMES):
+    """행들 중 각 속성 비트가 켜진 비율 (0~1)."""
+    return pd.Series(bit_matrix(bits, len(names)).mean(axis=0), index=names)
+
+
+def attr_rates_by(bits, labels, names=ATTR_NAMES):
+    """labels(그룹) 별 속성 비율 - 비트 행렬에 대한 group-by 평균."""
+    return pd.DataFrame(bit_matrix(bits, len(names)), columns=names).groupby(np.asarray(labels)).mean()
@@ -0,0 +1,159 @@
+"""리뷰 본문 대조 키워드 엔진: 문자 n-gram 문서-단어 희소 행렬 + 두 그룹 간 log-odds / 카이제곱 순위.
+
+한국어는 띄어쓰기/조사 때문에 단어 단위보다 문자 n-gram(기본 2~3글자)이 안정적이다.
+- 고유한 content 값(문서)마다 한글/영문 글자로만 이뤄진 n-gram 을 뽑는다 (공백·숫자·기호를 건너는 것은 제외)
+- 문서 CHUNK_DOCS 개씩 코드포인트(uint32) 배열 하나로 이어 붙여 n-gram 을 정수 id 로 한 번에 만든다
+  (문서 단위 Python 루프 없음, 코퍼스 전체를 한꺼번에 펼치지 않으므로 메모리는 묶음 크기만큼만)
+- D: 묶음별 문서 × n-gram 포함 여부 csr 을 어휘 번호를 맞춰 쌓은 것, min_df 개 문서 미만에 나온 n-gram 은 버림
+그룹 A / B (행 마스크) 비교는 행 → 문서 건수 벡터와 Dᵀ 의 곱 두 번이라 본문을 다시 훑지 않는다.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from roundlab.schema import text_values
+
+CP_BITS = 21  # 유니코드 코드포인트 비트 수
+METHODS = ('log_odds', 'chi2')
+NGRAM_RANGE = (2, 3)
+MIN_DF = 5
+CHUNK_DOCS = 20_000  # 한 번에 n-gram 으로 펼칠 문서 수 (메모리 상한)
+TERMS_VERSION = 2  # 행렬 계산을 바꾸면 올려서 .features/ 의 예전 terms-*.pkl 을 무효화
+TERM_PARAMS = {'version': TERMS_VERSION, 'column': 'content', 'ngram_range': list(NGRAM_RANGE), 'min_df': MIN_DF}  # load_or_build 캐시 키
+
+
+def _valid(cp):
+    """n-gram 에 쓸 글자: 한글 음절 / 한글 자모 / 영문 (소문자로 바꾼 뒤)."""
+    return (((cp >= 0xAC00) & (cp <= 0xD7A3)) | ((cp >= 0x3131) & (cp <= 0x318E))
+            | ((cp >= ord('a')) & (cp <= ord('z'))))
+
+
+def _decode(gram):
+    """n-gram 정수 id → 문자열 (앞 글자가 높은 비트)."""
+    chars = []
+    while gram:
+        chars.append(chr(gram & ((1 << CP_BITS) - 1)))
+        gram >>= CP_BITS
+    return ''.join(reversed(chars))
+
+
+def _gram_length(gram):
+    """n-gram 정수 id 배열 → 글자 수 (유효 글자는 코드포인트가 0 이 아님)."""
+    n = np.zeros(len(gram), dtype=np.int64)
+    gram = np.asarray(gram, dtype=np.int64)
+    while gram.any():
+        n += gram > 0
+        gram = gram >> CP_BITS
+    return n
+
+
+def char_ngrams(docs, ngram_range=NGRAM_RANGE):
+    """문서 목록 → (문서 번호 배열, n-gram id 배열) (같은 문서 안 중복 포함)."""
+    text = '\x00'.join(docs).lower()
+    cp = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    doc = np.cumsum(cp == 0, dtype=np.int32)  # 구분자 \x00 을 지날 때마다 문서 번호 + 1
+    ok = _valid(cp)
+
+    doc_ids, gram_ids = [np.zeros(0, dtype=np.int32)], [np.zeros(0, dtype=np.int64)]
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        m = len(cp) - n + 1
+        if m <= 0:
+            continue
+        keep = np.ones(m, dtype=bool)
+        gram = np.zeros(m, dtype=np.int64)
+        for k in range(n):
+            keep &= ok[k:k + m]
+            gram = (gram << CP_BITS) | cp[k:k + m]
+        doc_ids.append(doc[:m][keep])
+        gram_ids.append(gram[keep])
+    return np.concatenate(doc_ids), np.concatenate(gram_ids)
+
+
+class TermIndex:
+    """고유 content 문서 × 문자 n-gram 포함 여부 희소 행렬 (행 → 문서 코드로 연결)."""
+
+    def __init__(self, df, column='content', ngram_range=NGRAM_RANGE, min_df=MIN_DF):
+        codes, docs = pd.factorize(text_values(df[column]), sort=False)
+        self.doc_codes = codes.astype(np.int32)
+        docs = list(docs)
+
+        # 묶음마다 n-gram id → 묶음 어휘 번호 (해시 기반 factorize, 정렬 없음) → 문서 × 어휘 0/1 행렬 (중복은 1 로)
+        blocks, chunk_grams = [], []
+        for start in range(0, len(docs), CHUNK_DOCS):
+            chunk = docs[start:start + CHUNK_DOCS]
+            doc, gram = char_ngrams(chunk, ngram_range)
+            term, grams = pd.factorize(gram, sort=False)
+            block = sp.csr_matrix((np.ones(len(term), dtype=np.float32), (doc, term.astype(np.int32))),
+                                  shape=(len(chunk), len(grams)))
+            block.sum_duplicates()
+            block.data[:] = 1
+            blocks.append(block)
+            chunk_grams.append(grams)
+        # 묶음 어휘 → 전체 어휘 번호. char_ngrams 는 n 마다 코퍼스를 한 번씩 훑으므로 한 번에 만들면
+        # (n, 처음 나온 위치) 순서 → 묶음 어휘를 글자 수로 안정 정렬한 뒤 factorize 해야 같은 순서가 된다
+        local = np.concatenate(chunk_grams) if chunk_grams else np.zeros(0, dtype=np.int64)
+        by_length = np.argsort(_gram_length(local), kind='stable')
+        to_global = np.empty(len(local), dtype=np.int64)
+        to_global[by_length], grams = pd.factorize(local[by_length], sort=False)
+        offset = 0
+        for i, block in enumerate(blocks):
+            block.indices = to_global[offset:offset + block.shape[1]].astype(np.int32)[block.indices]
+            offset += block.shape[1]
+            blocks[i] = sp.csr_matrix((block.data, block.indices, block.indptr), shape=(block.shape[0], len(grams)))
+        D = sp.vstack(blocks, format='csr') if blocks else sp.csr_matrix((0, 0), dtype=np.float32)
+        D.sort_indices()
+        keep = np.bincount(D.indices, minlength=len(grams)) >= min_df
+        self.D = D[:, keep].tocsr()
+        self.terms = pd.Index([_decode(int(g)) for g in grams[keep]], name='Term')
+
+    def term_counts(self, rows):
+        """rows(행 bool 마스크)의 리뷰 중 각 n-gram 을 포함한 리뷰 수, 리뷰 수."""
+        docs = self.doc_codes[rows]
+        weight = np.bincount(docs[docs >= 0], minlength=self.D.shape[0]).astype(np.float64)
+        return np.asarray(self.D.T @ weight).ravel(), len(docs)
+
+    def contrast(self, rows_a, rows_b, method='log_odds', top_k=20, prior=None):
+        """A 그룹에서 B 보다 두드러지는 n-gram Top k DataFrame (Term / A(%) / B(%) / Score, Score 큰 순).
+
+        - log_odds: 정보적 디리클레 사전분포를 둔 log-odds 비율의 z 점수 (Monroe et al. 2008),
+          prior 는 n-gram 별 기준 건수(기본: A+B 합계)
+        - chi2: 2×2 (포함 여부 × 그룹) 카이제곱, A 쪽 비율이 더 낮으면 음수
+        더 긴 n-gram 에 포함되면서 두 그룹 건수까지 같은 n-gram('트러블' 안의 '트러')은 긴 쪽만 남긴다.
+        """
+        y_a, n_a = self.term_counts(rows_a)
+        y_b, n_b = self.term_counts(rows_b)
+        if method == 'log_odds':
+            base = y_a + y_b if prior is None else prior
+            alpha = base / max(base.sum(), 1) * len(self.terms) + 0.01
+            a0 = alpha.sum()
+            tot_a, tot_b = y_a.sum(), y_b.sum()
+            delta = (np.log((y_a + alpha) / (tot_a + a0 - y_a - alpha))
+                     - np.log((y_b + alpha) / (tot_b + a0 - y_b - alpha)))
+            score = delta / np.sqrt(1 / (y_a + alpha) + 1 / (y_b + alpha))
+        elif method == 'chi2':
+            a, b, c, d = y_a, n_a - y_a, y_b, n_b - y_b
+            denom = (a + b) * (c + d) * (a + c) * (b + d)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                chi2 = np.where(denom > 0, (n_a + n_b) * (a * d - b * c) ** 2 / denom, 0)
+            score = np.sign(y_a / max(n_a, 1) - y_b / max(n_b, 1)) * chi2
+        else:
+            raise ValueError(f'알 수 없는 방법: {method} (가능: {METHODS})')
+
+        k = min(top_k * 5, len(score))
+        cand = np.argpartition(-score, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+        lengths = self.terms.str.len().to_numpy()
+        cand = cand[np.lexsort((cand, -lengths[cand], -score[cand]))]  # 점수 내림차순, 같으면 긴 n-gram 먼저
+        top = []
+        for i in cand:
+            if len(top) == top_k:
+                break
+            term = self.terms[i]
+            if not any(term in self.terms[j] and y_a[j] == y_a[i] and y_b[j] == y_b[i] for j in top):
+                top.append(i)
+        top = np.asarray(top, dtype=np.int64)
+        return pd.DataFrame({
+            'Term': self.terms[top],
+            'A(%)': y_a[top] / max(n_a, 1) * 100,
+            'B(%)': y_b[top] / max(n_b, 1) * 100,
+            'Score': score[top],
+        })
@@ -0,0 +1,206 @@
+"""분석 단계별 계측 (rerun 마다 단계별 실행 시간 / 캐시 hit·miss / 입력 행 수 / 프로세스 RSS 최고치).
+
+    tracer = current()
+    tracer.begin_run(tab='Market', memory=True)
+    with tracer.span('market_share', rows=len(df)):
+        ...
+
+RSS 는 begin_run(memory=True) 인 rerun 에서만 샘플링한다 (span 마다 /proc 폴링 스레드를 띄우므로).
+RSS 는 프로세스 전체 값이라 proc_rss_mb 에는 같은 프로세스에서 동시에 돈 다른 세션의 할당도 섞인다
+(단계별 메모리가 아니라 그 단계 동안 프로세스 RSS 가 얼마나 올라갔는지).
+
+캐시 함수는 traced(name, st.cache_data) 로 감싸면 캐시 본문이 실제로 돌았는지(miss)까지 기록된다.
+기록은 스레드(= Streamlit 세션 스크립트 실행)마다 따로 쌓이고, 가장 바깥 span 이 끝날 때마다
+프로세스 공용 HISTORY 로 옮겨져 JSON / CSV 로 내보낼 수 있다.
+"""
+import functools
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+MB = 1024 * 1024
+HISTORY_SIZE = 5000  # 프로세스 공용으로 보관할 최근 기록 수
+FIELDS = ['run', 'tab', 'step', 'depth', 'cache', 'rows', 'wall_ms', 'proc_rss_mb', 'ts']
+
+
+def _rss():
+    """현재 RSS (바이트). /proc 이 없으면 프로세스 최고치(ru_maxrss)로 대신한다."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class RssSampler:
+    """with 블록 동안 RSS 를 interval 초마다 읽어 최고치를 기록."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.base = self.peak = 0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss())
+
+    def __enter__(self):
+        self.base = self.peak = _rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss())
+
+    @property
+    def delta(self):
+        return self.peak - self.base
+
+
+HISTORY = deque(maxlen=HISTORY_SIZE)
+_HISTORY_LOCK = threading.Lock()
+_RUN_IDS = iter(range(1, sys.maxsize))
+
+
+class Tracer:
+    """rerun 하나의 단계별 기록. span 은 중첩 가능 (depth = 중첩 깊이)."""
+
+    def __init__(self):
+        self.run = 0
+        self.tab = ''
+        self.memory = False
+        self._pending = []
+        self._stack = []
+
+    @property
+    def depth(self):
+        """지금 열린 span 수 (0 = 어느 span 안도 아님)."""
+        return len(self._stack)
+
+    def begin_run(self, tab='', memory=False):
+        """새 rerun 시작 (이후 기록에 붙는 run 번호 / 탭, memory=True 면 span 마다 프로세스 RSS 샘플링)."""
+        self.run = next(_RUN_IDS)
+        self.tab = tab
+        self.memory = memory
+
+    @contextmanager
+    def span(self, step, rows=None):
+        rec = {'run': self.run, 'tab': self.tab, 'step': step, 'depth': len(self._stack), 'cache': None,
+               'rows': rows, 'wall_ms': 0.0, 'proc_rss_mb': None, 'ts': time.time()}
+        self._stack.append(rec)
+        sampler = RssSampler() if self.memory else nullcontext()
+        try:
+            with sampler:
+                t0 = time.perf_counter()
+                yield rec
+        finally:
+            rec['wall_ms'] = (time.perf_counter() - t0) * 1000
+            if self.memory:
+                rec['proc_rss_mb'] = sampler.delta / MB
+            self._stack.pop()
+            self._pending.append(rec)
+            if not self._stack:
+                with _HISTORY_LOCK:
+                    HISTORY.extend(self._pending)
+                self._pending = []
+
+    def mark_miss(self):
+        """지금 열린 span 의 캐시 본문이 실행됨 (캐시 miss)."""
+        if self._stack:
+            self._stack[-1]['cache'] = 'miss'
+
+
+_LOCAL = threading.local()
+
+
+def current():
+    """지금 스레드(세션 스크립트 실행)의 Tracer."""
+    if not hasattr(_LOCAL, 'tracer'):
+        _LOCAL.tracer = Tracer()
+    return _LOCAL.tracer
+
+
+def _rows(args, kwargs):
+    """인자 중 첫 DataFrame 의 행 수."""
+    for a in list(args) + list(kwargs.values()):
+        if isinstance(a, pd.DataFrame):
+            return len(a)
+    return None
+
+
+def traced(step, cache=None):
+    """함수 호출을 span 으로 기록하는 데코레이터. cache(st.cache_data 등)를 주면 그 안쪽에서 miss 를 표시.
+
+        @traced('get_market_share', st.cache_data)
+        def get_market_share(df): ...
+    """
+    def deco(fn):
+        if cache is None:
+            body = fn
+        else:
+            @functools.wraps(fn)
+            def body(*args, **kwargs):
+                current().mark_miss()
+                return fn(*args, **kwargs)
+            body = cache(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with current().span(step, _rows(args, kwargs)) as rec:
+                if cache is not None:
+                    rec['cache'] = 'hit'
+                out = body(*args, **kwargs)
+                if rec['rows'] is None and isinstance(out, pd.DataFrame):
+                    rec['rows'] = len(out)  # 입력 df 가 없는 로드 단계는 결과 행 수
+                return out
+
+        if cache is not None:
+            wrapper.clear = getattr(body, 'clear', None)
+        return wrapper
+    return deco
+
+
+def history():
+    """프로세스 공용 기록 (끝난 span) DataFrame."""
+    with _HISTORY_LOCK:
+        rows = list(HISTORY)
+    return pd.DataFrame(rows, columns=FIELDS)
+
+
+def summarize(frame):
+    """step 별 호출 수 / 캐시 hit 비율 / 실행 시간(중앙값·최대) / 프로세스 RSS 증가 최고치, 총 시간 큰 순."""
+    if frame.empty:
+        return pd.DataFrame(columns=['step', 'calls', 'hit_rate', 'total_ms', 'median_ms', 'max_ms', 'proc_rss_mb'])
+    # 스냅샷 조회(snapshot)도 hit 로 센다, 캐시 없는 단계는 NaN
+    g = frame.assign(hit=frame['cache'].map({'hit': 1.0, 'snapshot': 1.0, 'miss': 0.0})).groupby('step')
+    out = pd.DataFrame({
+        'calls': g.size(),
+        'hit_rate': g['hit'].mean(),
+        'total_ms': g['wall_ms'].sum(),
+        'median_ms': g['wall_ms'].median(),
+        'max_ms': g['wall_ms'].max(),
+        'proc_rss_mb': g['proc_rss_mb'].max(),
+    })
+    return out.sort_values('total_ms', ascending=False).reset_index()
+
+
+def to_json(frame):
+    return json.dumps(frame.to_dict(orient='records'), ensure_ascii=False, default=str)
+
+
+def to_csv(frame):
+    buf = io.StringIO()
+    frame.to_csv(buf, index=False)
+    return buf.getvalue()
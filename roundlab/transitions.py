@@ -0,0 +1,174 @@
+"""브랜드 전이(유입/이탈) 인덱스.
+
+(user_id, date) 로 정렬된 유저 타임라인에서 행마다 직전/직후 구매 브랜드를 한 번 계산해 두고,
+- 브랜드 → 브랜드 전이 횟수 희소 행렬
+- 멤버십 인덱스 key(브랜드/제품군/독도 등)마다 '직전 브랜드 × 상품' / '직후 브랜드 × 상품' 희소 행렬
+을 미리 만들어 둔다. 조회는 행렬의 한 행을 읽는 것뿐이라 위젯을 바꿔도 재계산이 없다.
+새 데이터 조각이 붙으면 extend() 로 새 행이 있는 유저의 타임라인만 다시 집계한다.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from roundlab.brand_index import BITS_COLUMN, KEYS, bit_of
+from roundlab.feature_store import user_date_order
+from roundlab.schema import MISSING_USER
+
+TRANSITIONS_VERSION = 1  # 인덱스 로직을 바꾸면 올려서 .features/ 의 예전 transitions-*.pkl 을 무효화
+TRANSITION_PARAMS = {'version': TRANSITIONS_VERSION}  # load_or_build 캐시 키
+
+
+def self_key(key):
+    """유입/이탈 집계에서 '같은 브랜드 안에서의 이동'으로 보고 제외할 key."""
+    if key.startswith(('brand:', 'product:')):
+        return 'brand:' + key.split(':', 1)[1]
+    if key in ('roundlab', 'dokdo', 'dokdo_toner'):
+        return 'roundlab'
+    return key
+
+
+def _shift(a, same, step, fill):
+    """타임라인 배열을 같은 유저 안에서만 한 칸 민다 (step=1: 직전, -1: 직후)."""
+    out = np.full_like(a, fill)
+    if step == 1:
+        out[1:] = np.where(same, a[:-1], fill)
+    else:
+        out[:-1] = np.where(same, a[1:], fill)
+    return out
+
+
+def _remap(mat, row_map, col_map, shape):
+    """예전 category 코드 공간의 희소 행렬을 새 코드 공간(shape)으로 옮긴다."""
+    coo = mat.tocoo()
+    out = sp.csr_matrix((coo.data, (row_map[coo.row], col_map[coo.col])), shape=shape)
+    out.sum_duplicates()
+    return out
+
+
+class TransitionIndex:
+    """유저 타임라인 기반 직전/직후 브랜드 인덱스 (데이터 로드당 한 번 생성, 조각 추가 시 extend)."""
+
+    def __init__(self, df):
+        self.brands = df['brand'].cat.categories
+        self.goods = df['goods_name'].cat.categories
+        self.n_rows = len(df)
+        self.matrix, self.inflow, self.outflow = self._tally(*self._arrays(df, user_date_order(df)))
+
+    @staticmethod
+    def _arrays(df, order):
+        """(user, brand 코드, goods 코드, brand_bits) 를 order 순서로."""
+        return (df['user_id'].to_numpy()[order],
+                df['brand'].cat.codes.to_numpy().astype(np.int32)[order],
+                df['goods_name'].cat.codes.to_numpy().astype(np.int32)[order],
+                df[BITS_COLUMN].to_numpy()[order])
+
+    def _tally(self, u, b, g, bits):
+        """(user_id, date) 순서로 놓인 행들의 전이 건수: (브랜드 전이 행렬, key 별 유입, key 별 이탈).
+
+        user_id 결측(MISSING_USER) 행들은 한 유저의 타임라인이 아니므로 서로 잇지 않는다.
+        """
+        same = (u[1:] == u[:-1]) & (u[1:] != MISSING_USER)
+        prev_b, next_b = _shift(b, same, 1, -1), _shift(b, same, -1, -1)
+        prev_bits, next_bits = _shift(bits, same, 1, 0), _shift(bits, same, -1, 0)
+
+        # 브랜드 → 브랜드 (같은 유저의 연속 구매)
+        pair = same & (b[:-1] >= 0) & (b[1:] >= 0)
+        matrix = self._counts(b[:-1][pair], b[1:][pair], len(self.brands))
+
+        # key 별 유입(직전 브랜드) / 이탈(직후 브랜드) - 자기 브랜드 안의 이동은 제외
+        inflow, outflow = {}, {}
+        for key in KEYS:
+            in_key = (bits & bit_of(key)) != 0
+            excl = bit_of(self_key(key))
+            inflow[key] = self._flow(prev_b, g, in_key & (prev_b >= 0) & ((prev_bits & excl) == 0))
+            outflow[key] = self._flow(next_b, g, in_key & (next_b >= 0) & ((next_bits & excl) == 0))
+        return matrix, inflow, outflow
+
+    def extend(self, df, n_old):
+        """df 앞 n_old 행으로 만든 인덱스에 뒤에 붙은 행(새 조각)을 반영한다.
+
+        새 행이 있는 유저의 타임라인만 빼고 다시 더한다 (나머지 유저의 전이는 그대로).
+        user_id 코드는 첫 등장 순서라 앞 행들의 코드는 바뀌지 않는다.
+        """
+        brands, goods = df['brand'].cat.categories, df['goods_name'].cat.categories
+        if not (brands.equals(self.brands) and goods.equals(self.goods)):
+            # 새 브랜드/상품이 생기면 category 코드가 바뀜 → 기존 행렬을 새 코드 공간으로
+            b_map, g_map = brands.get_indexer(self.brands), goods.get_indexer(self.goods)
+            nb, ng = len(brands), len(goods)
+            self.matrix = _remap(self.matrix, b_map, b_map, (nb, nb))
+            for flows in (self.inflow, self.outflow):
+                for key, (totals, mat) in flows.items():
+                    moved = np.zeros(nb, dtype=totals.dtype)
+                    moved[b_map] = totals
+                    flows[key] = (moved, _remap(mat, b_map, g_map, (nb, ng)))
+            self.brands, self.goods = brands, goods
+
+        u, d = df['user_id'].to_numpy(), df['date'].to_numpy()
+        touched = np.isin(u, np.unique(u[n_old:])) & (u != MISSING_USER)  # 결측 행은 전이가 없어 다시 셀 필요 없음
+        for rows, sign in ((np.flatnonzero(touched[:n_old]), -1), (np.flatnonzero(touched), 1)):
+            order = rows[np.lexsort((d[rows], u[rows]))]  # 안정 정렬 → compute_user_seq 와 같은 순서
+            matrix, inflow, outflow = self._tally(*self._arrays(df, order))
+            self.matrix = self.matrix + sign * matrix
+            for flows, delta in ((self.inflow, inflow), (self.outflow, outflow)):
+                for key, (totals, mat) in delta.items():
+                    old_totals, old_mat = flows[key]
+                    flows[key] = (old_totals + sign * totals, old_mat + sign * mat)
+
+        self.matrix.eliminate_zeros()
+        for flows in (self.inflow, self.outflow):
+            for _, mat in flows.values():
+                mat.eliminate_zeros()
+        self.n_rows = len(df)
+        return self
+
+    @staticmethod
+    def _counts(rows, cols, n_rows, n_cols=None):
+        n_cols = n_rows if n_cols is None else n_cols
+        data = np.ones(len(rows), dtype=np.int64)
+        mat = sp.csr_matrix((data, (rows, cols)), shape=(n_rows, n_cols))
+        mat.sum_duplicates()  # 중복 좌표 합산 + 열 인덱스 정렬
+        return mat
+
+    def _flow(self, other_b, g, mask):
+        """(상대 브랜드별 건수 배열, 상대 브랜드 × 상품 희소 행렬)."""
+        totals = np.bincount(other_b[mask], minlength=len(self.brands)).astype(np.int64)
+        has_goods = mask & (g >= 0)
+        return totals, self._counts(other_b[has_goods], g[has_goods], len(self.brands), len(self.goods))
+
+    def _totals(self, flow):
+        totals = pd.Series(flow[0], index=self.brands, name='count')
+        return totals[totals > 0].sort_values(ascending=False, kind='stable')
+
+    def _detail(self, flow, brand):
+        _, mat = flow
+        idx = self.brands.get_loc(brand)
+        row = mat[idx]
+        s = pd.Series(row.data, index=self.goods[row.indices], name='count')
+        s.index.name = 'goods_name'
+        return s.sort_values(ascending=False, kind='stable')
+
+    def inflow_counts(self, key):
+        """key 구매 직전에 산 (다른) 브랜드별 건수, 많은 순."""
+        return self._totals(self.inflow[key])
+
+    def outflow_counts(self, key):
+        """key 구매 직후에 산 (다른) 브랜드별 건수, 많은 순."""
+        return self._totals(self.outflow[key])
+
+    def inflow_detail(self, key, brand):
+        """직전 브랜드가 brand 인 key 구매의 상품별 건수."""
+        return self._detail(self.inflow[key], brand)
+
+    def outflow_detail(self, key, brand):
+        """직후 브랜드가 brand 인 key 구매의 상품별 건수."""
+        return self._detail(self.outflow[key], brand)
+
+    def next_brands(self, brand):
+        """brand 다음에 구매한 브랜드별 건수 (브랜드 → 브랜드 전이 행렬의 행)."""
+        row = self.matrix[self.brands.get_loc(brand)]
+        return pd.Series(row.data, index=self.brands[row.indices], name='count').sort_values(ascending=False, kind='stable')
+
+    def prev_brands(self, brand):
+        """brand 직전에 구매한 브랜드별 건수 (전이 행렬의 열)."""
+        col = self.matrix[:, self.brands.get_loc(brand)].tocoo()
+        return pd.Series(col.data, index=self.brands[col.row], name='count').sort_values(ascending=False, kind='stable')
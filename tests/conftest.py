@@ -0,0 +1,19 @@
+import pytest
+
+from roundlab.feature_store import load_dataset
+from roundlab.synthetic import generate, write_parts
+
+N_ROWS = 20_000
+
+
+@pytest.fixture(scope='session')
+def data_dir(tmp_path_factory):
+    """합성 데이터 data_part1..4.parquet 가 있는 임시 폴더 (세션당 한 번)."""
+    path = tmp_path_factory.mktemp('data')
+    write_parts(generate(N_ROWS, seed=0), str(path))
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def df(data_dir):
+    return load_dataset(data_dir)
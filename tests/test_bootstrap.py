@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from roundlab import engine
+from roundlab.bootstrap import lift_intervals, repurchase_intervals
+from roundlab.cohorts import Cohorts
+from roundlab.constants import TARGETS
+
+N_RESAMPLES = 200
+
+
+@pytest.fixture(scope='module')
+def cohorts(df):
+    return Cohorts(df)
+
+
+def _bracketed(table, col):
+    # 백분위수 구간이 점추정을 감싼다 (재표본이 전부 같은 값이면 구간 = 점)
+    eps = 1e-9
+    return ((table['CI Low'] <= table[col] + eps) & (table[col] - eps <= table['CI High'])).all()
+
+
+def test_repurchase_intervals_bracket_engine(df, cohorts):
+    table = repurchase_intervals(df, cohorts=cohorts, n_resamples=N_RESAMPLES, processes=1)
+    stats = engine.repurchase_stats(df, cohorts)
+    assert set(table['Brand']) == set(stats.index)
+    point = stats.stack().rename('expected').rename_axis(['Brand', 'Attribute']).reset_index()
+    merged = table.merge(point, on=['Brand', 'Attribute'])
+    assert len(merged) == len(table)
+    np.testing.assert_allclose(merged['Rate(%)'], merged['expected'])
+    assert _bracketed(table, 'Rate(%)')
+
+
+def test_lift_intervals_bracket_engine(df, cohorts):
+    table = lift_intervals(df, cohorts=cohorts, n_resamples=N_RESAMPLES, processes=1)
+    assert len(table)
+    for brand in TARGETS:
+        lift = engine.attribute_lift(df, brand, cohorts)
+        sub = table[table['Brand'] == brand].set_index('Attribute')['Lift']
+        if lift.empty:
+            assert sub.empty
+            continue
+        pd.testing.assert_series_equal(sub.sort_index(), lift.sort_index(), check_names=False, check_index_type=False)
+    assert _bracketed(table, 'Lift')
+
+
+def test_seed_reproducible(df, cohorts):
+    args = dict(cohorts=cohorts, n_resamples=N_RESAMPLES)
+    first = lift_intervals(df, seed=7, processes=1, **args)
+    pd.testing.assert_frame_equal(first, lift_intervals(df, seed=7, processes=1, **args))
+    # 작업마다 시드를 나누므로 풀 크기와 무관
+    pd.testing.assert_frame_equal(first, lift_intervals(df, seed=7, processes=2, **args))
+    assert not first['CI Low'].equals(lift_intervals(df, seed=8, processes=1, **args)['CI Low'])
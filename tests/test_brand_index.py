@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from roundlab.brand_index import BITS_COLUMN, KEYS, RULES, add_brand_index, key_mask
+
+
+def _naive_mask(df, key):
+    """규칙마다 원본 문자열에 str.contains 를 직접 돌린 결과 (결측은 False)."""
+    brand_pat, goods_pats, case = RULES[key]
+    mask = df['brand'].astype(str).str.contains(brand_pat, case=case, na=False) & df['brand'].notna()
+    for pat in goods_pats:
+        mask &= df['goods_name'].astype(str).str.contains(pat, case=case, na=False) & df['goods_name'].notna()
+    return mask.to_numpy(dtype=bool)
+
+
+def test_bits_match_str_contains(df):
+    for key in KEYS:
+        np.testing.assert_array_equal(key_mask(df, key), _naive_mask(df, key), err_msg=key)
+
+
+def test_missing_and_case():
+    frame = pd.DataFrame({
+        'brand': pd.Series(['라운드랩', None, '라운드랩', 'ROUNDLAB', '토리든'], dtype='category'),
+        'goods_name': pd.Series(['1025 독도 토너', '독도 토너', None, '독도 토너', '다이브인 토너'], dtype='category'),
+    })
+    add_brand_index(frame)
+    assert frame[BITS_COLUMN].dtype.kind == 'u'
+    for key in KEYS:
+        np.testing.assert_array_equal(key_mask(frame, key), _naive_mask(frame, key), err_msg=key)
+    assert key_mask(frame, 'dokdo_toner').tolist() == [True, False, False, False, False]
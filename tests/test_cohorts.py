@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from roundlab.brand_index import KEYS, key_mask
+from roundlab.cohorts import CHURNED, LOYAL, NONE, ONE, REPEAT, REPEATERS, SEGMENT_NAMES, Cohorts
+from roundlab.feature_store import load_dataset
+from roundlab.schema import MISSING_USER
+from roundlab.synthetic import generate, write_parts
+
+AS_OF = '2024-03-01'
+
+
+def test_as_of_ignores_later_purchases(df):
+    cohorts = Cohorts(df, as_of=AS_OF)
+    before = (df['date'] <= pd.Timestamp(AS_OF)).to_numpy()
+    idx = df['user_id'].to_numpy().astype(np.int64) + 1
+    for key in KEYS:
+        target = key_mask(df, key) & before
+        expected = np.bincount(idx[target], minlength=cohorts.n_users)
+        np.testing.assert_array_equal(cohorts.counts(key), expected)
+        assert cohorts.days_since_last(key).min() >= -1
+        # 기준일 이후에만 산 유저는 어느 세그먼트에도 들지 않는다
+        seg = cohorts.segments(key)
+        assert not seg[expected == 0].any()
+
+
+def test_as_of_repeaters_bought_before_cutoff(df):
+    cohorts = Cohorts(df, as_of=AS_OF)
+    late = df[df['date'] > pd.Timestamp(AS_OF)]
+    only_late = np.setdiff1d(late['user_id'].to_numpy(), df.loc[df['date'] <= pd.Timestamp(AS_OF), 'user_id'].to_numpy())
+    seg = cohorts.segments('dokdo')
+    assert not np.isin(seg[only_late + 1], REPEATERS).any()
+
+
+def test_default_as_of_matches_last_date(df):
+    cohorts = Cohorts(df)
+    assert cohorts.as_of == df['date'].max().to_datetime64()
+    for key in KEYS:
+        assert cohorts.days_since_last(key).min() >= -1
+        np.testing.assert_array_equal(cohorts.counts(key), Cohorts(df, as_of=df['date'].max()).counts(key))
+
+
+def test_missing_users_stay_out_of_segments(tmp_path):
+    # user_id 결측 행이 섞인 데이터: 원본처럼 value_counts(결측 버림) 기준 숫자와 같아야 한다
+    table = generate(4_000, seed=1)
+    user = table['user_id'].to_pandas().astype(object)
+    user[np.random.default_rng(0).random(len(user)) < 0.05] = None
+    table = table.set_column(table.schema.get_field_index('user_id'), 'user_id', pa.array(user, pa.string()))
+    write_parts(table, str(tmp_path))
+    df = load_dataset(str(tmp_path))
+    assert (df['user_id'] == MISSING_USER).any()
+
+    cohorts = Cohorts(df)
+    raw = pd.Series(user.to_numpy())
+    for key in KEYS:
+        seg = cohorts.segments(key)
+        assert seg[MISSING_USER + 1] == NONE
+        assert cohorts.counts(key)[MISSING_USER + 1] == 0
+        per_user = raw[key_mask(df, key) & df['date'].notna().to_numpy()].value_counts()
+        sizes = cohorts.sizes(key)
+        assert sizes[SEGMENT_NAMES[ONE]] + sizes[SEGMENT_NAMES[CHURNED]] == (per_user == 1).sum()
+        assert sizes[SEGMENT_NAMES[REPEAT]] == (per_user == 2).sum()
+        assert sizes[SEGMENT_NAMES[LOYAL]] == (per_user >= 3).sum()
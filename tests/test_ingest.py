@@ -0,0 +1,75 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from roundlab import ingest
+from roundlab.aggregates import AGGREGATE_PARAMS, DatasetAggregates
+from roundlab.feature_store import load_dataset, load_or_build
+from roundlab.loader import find_parts
+from roundlab.synthetic import generate, write_parts
+from roundlab.transitions import TRANSITION_PARAMS, TransitionIndex
+
+N_OLD, N_NEW, N_DUP = 15_000, 5_000, 200
+
+
+def _assert_sparse_equal(a, b):
+    assert a.shape == b.shape and (a != b).nnz == 0
+
+
+@pytest.fixture
+def ingested(tmp_path, monkeypatch):
+    """조각 3개를 적재·캐시한 뒤 새 파일(기존 행 일부 중복 포함)을 ingest + warm 한 폴더."""
+    table = generate(N_OLD + N_NEW, seed=1)
+    data_dir = str(tmp_path)
+    write_parts(table.slice(0, N_OLD), data_dir, n_parts=3)
+    ingest.warm(data_dir)
+
+    new = pa.concat_tables([table.slice(N_OLD), table.slice(0, N_DUP)])
+    new_path = str(tmp_path / 'new_reviews.parquet')
+    pq.write_table(new, new_path)
+
+    calls = []
+    for cls in (TransitionIndex, DatasetAggregates):
+        def spy(self, df, n_old, _extend=cls.extend):
+            calls.append((type(self).__name__, n_old))
+            return _extend(self, df, n_old)
+        monkeypatch.setattr(cls, 'extend', spy)
+    summary = ingest.ingest([new_path], data_dir)
+    ingest.warm(data_dir)
+    return data_dir, new, summary, calls
+
+
+def test_ingest_drops_duplicates(ingested):
+    data_dir, new, summary, _ = ingested
+    old_keys = ingest.row_keys(pa.concat_tables([pq.read_table(p) for p in find_parts(data_dir)[:3]]))
+    new_keys = ingest.row_keys(new)
+    expected = len(np.setdiff1d(np.unique(new_keys), old_keys))
+    assert summary['appended'] == expected
+    assert summary['duplicates'] == len(new_keys) - expected >= N_DUP
+    assert len(find_parts(data_dir)) == 4
+    assert len(load_dataset(data_dir)) == N_OLD + expected
+
+
+def test_extend_matches_full_rebuild(ingested):
+    data_dir, _, _, calls = ingested
+    df = load_dataset(data_dir)
+    # warm 이 새 조각만 반영하는 extend 경로를 탔는지
+    assert sorted(calls) == [('DatasetAggregates', N_OLD), ('TransitionIndex', N_OLD)]
+
+    t_ext = load_or_build('transitions', df, TransitionIndex, data_dir, params=TRANSITION_PARAMS)
+    t_full = TransitionIndex(df)
+    assert t_ext.brands.equals(t_full.brands) and t_ext.goods.equals(t_full.goods)
+    _assert_sparse_equal(t_ext.matrix, t_full.matrix)
+    for name in ('inflow', 'outflow'):
+        ext, full = getattr(t_ext, name), getattr(t_full, name)
+        assert ext.keys() == full.keys()
+        for key in full:
+            np.testing.assert_array_equal(ext[key][0], full[key][0])
+            _assert_sparse_equal(ext[key][1], full[key][1])
+
+    a_ext = load_or_build('aggregates', df, DatasetAggregates, data_dir, params=AGGREGATE_PARAMS)
+    a_full = DatasetAggregates(df)
+    assert a_ext.n_rows == a_full.n_rows == len(df)
+    _assert_sparse_equal(a_ext.user_counts, a_full.user_counts)
+    assert a_ext.daily.equals(a_full.daily)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from roundlab.model import FACTORS, fit_all, fit_logistic, odds_table
+
+TRUE_COEF = np.array([0.8, -0.5, 0.0, 1.2, -1.0, 0.3, 0.6])
+TRUE_INTERCEPT = -0.4
+
+
+def _design(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, len(TRUE_COEF)))
+    p = 1 / (1 + np.exp(-(TRUE_INTERCEPT + X @ TRUE_COEF)))
+    return X, (rng.random(n) < p).astype(np.float64)
+
+
+def test_recovers_known_coefficients():
+    X, y = _design(20_000)
+    fit = fit_logistic(X, y, l2=0)
+    assert fit['converged']
+    # 참값이 Wald 신뢰구간(4 표준오차) 안에
+    assert np.all(np.abs(fit['coef'] - TRUE_COEF) < 4 * fit['se'])
+    assert abs(fit['intercept'] - TRUE_INTERCEPT) < 0.1
+    # 정규화는 계수를 0 쪽으로 줄인다
+    shrunk = fit_logistic(X, y, l2=1000)
+    assert np.all(np.abs(shrunk['coef']) <= np.abs(fit['coef']) + 1e-12)
+
+
+def test_separation_stays_finite():
+    # 첫 피처가 y 를 완벽히 가름 → 정규화 없으면 계수가 발산, L2 로 유한한 값에 수렴
+    X, _ = _design(500, seed=1)
+    y = (X[:, 0] > 0).astype(np.float64)
+    fit = fit_logistic(X, y)
+    assert fit['converged']
+    assert np.all(np.isfinite(fit['coef'])) and np.all(np.isfinite(fit['se']))
+    assert fit['coef'][0] > 0
+    table = odds_table('sep', fit, y)
+    assert np.isfinite(table[['Odds Ratio', 'CI Low', 'CI High', 'p']].to_numpy()).all()
+
+
+def test_all_zero_feature():
+    X, y = _design(2_000, seed=2)
+    X[:, 2] = 0
+    fit = fit_logistic(X, y)
+    assert fit['converged']
+    assert fit['coef'][2] == 0
+    assert np.all(np.isfinite(fit['se']))
+    table = odds_table('zero', fit, y)
+    row = table[table['Factor'] == FACTORS[2]].iloc[0]
+    assert row['Odds Ratio'] == 1 and row['Impact'] == 'Neutral'
+    assert np.isfinite(table[['CI Low', 'CI High']].to_numpy()).all()
+
+
+def test_fit_all_tables_are_finite(df):
+    table = fit_all(df, processes=1)
+    assert set(table['Factor']) == set(FACTORS)
+    assert np.isfinite(table[['Odds Ratio', 'CI Low', 'CI High', 'p']].to_numpy()).all()
+    assert ((table['CI Low'] <= table['Odds Ratio']) & (table['Odds Ratio'] <= table['CI High'])).all()
+    assert (table['n'] > 0).all()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from roundlab.sketch import HLL_P, HyperLogLog, PartStats, dataset_stats
+
+# 표준 오차 1.04 / sqrt(2^p) ≈ 0.81% - 4 배(약 3.3%) 안에 들어야 한다
+BOUND = 4 * 1.04 / np.sqrt(1 << HLL_P)
+
+
+@pytest.mark.parametrize('n', [100, 5_000, 50_000, 300_000])
+def test_count_within_error_bound(n):
+    values = np.arange(n)
+    est = HyperLogLog().add(values).count()
+    assert abs(est - n) <= max(BOUND * n, 2)
+
+
+def test_duplicates_do_not_change_count():
+    values = np.arange(20_000)
+    once = HyperLogLog().add(values)
+    thrice = HyperLogLog().add(np.concatenate([values, values, values]))
+    np.testing.assert_array_equal(once.registers, thrice.registers)
+
+
+def test_merge_equals_union():
+    a, b = np.arange(0, 30_000), np.arange(20_000, 60_000)
+    merged = HyperLogLog().add(a).merge(HyperLogLog().add(b))
+    np.testing.assert_array_equal(merged.registers, HyperLogLog().add(np.union1d(a, b)).registers)
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def test_dataset_stats_match_exact(data_dir, df):
+    kpis = dataset_stats(data_dir).kpis()
+    assert kpis['rows'] == len(df)
+    assert kpis['date_min'] == df['date'].min() and kpis['date_max'] == df['date'].max()
+    n_users = df['user_id'].nunique()
+    assert abs(kpis['unique_users'] - n_users) <= BOUND * n_users
+    n_products = df['full_name'].nunique()
+    assert abs(kpis['products'] - n_products) <= max(BOUND * n_products, 2)
+    # price 컬럼이 없는 데이터는 가격 KPI 를 만들지 않는다
+    assert kpis['price_matched'] is None and kpis['coverage'] is None
+
+
+def test_partial_stats_merge():
+    frame = pd.DataFrame({'user_id': ['a', 'b', 'a', None], 'full_name': ['x', 'y', 'x', 'z'],
+                          'date': ['2024-01-02', '2024-03-01', None, '2024-02-01'], 'price': [1.0, None, 2.0, 3.0]})
+    total = PartStats.from_table(frame.iloc[:2]).merge(PartStats.from_table(frame.iloc[2:]))
+    kpis = total.kpis()
+    assert kpis['rows'] == 4 and kpis['unique_users'] == 2 and kpis['products'] == 3
+    assert kpis['price_matched'] == 3 and kpis['coverage'] == 75
+    assert kpis['date_min'] == pd.Timestamp('2024-01-02') and kpis['date_max'] == pd.Timestamp('2024-03-01')
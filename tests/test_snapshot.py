@@ -0,0 +1,67 @@
+import json
+import logging
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from roundlab import constants, snapshot
+
+
+@pytest.fixture(scope='module')
+def snap_path(data_dir, tmp_path_factory):
+    out = tmp_path_factory.mktemp('snapshot') / snapshot.SNAPSHOT_NAME
+    return snapshot.build(data_dir, str(out), log=lambda *_: None)
+
+
+def _assert_same(a, b):
+    if isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b, check_dtype=False, check_index_type=False, check_column_type=False)
+    elif isinstance(a, pd.Series):
+        pd.testing.assert_series_equal(a, b, check_dtype=False, check_index_type=False)
+    elif isinstance(a, np.ndarray):
+        np.testing.assert_array_equal(a, b)
+    elif isinstance(a, dict):
+        assert list(a) == list(b)
+        for k in a:
+            _assert_same(a[k], b[k])
+    elif isinstance(a, (tuple, list)):
+        assert type(a) is type(b) and len(a) == len(b)
+        for x, y in zip(a, b):
+            _assert_same(x, y)
+    else:
+        assert a == b
+
+
+def test_round_trip(data_dir, snap_path):
+    snap = snapshot.open_snapshot(snap_path, data_dir)
+    assert snap is not None and len(snap) > 0
+    ctx = snapshot.Context(data_dir)
+    for name, (params_fn, fn) in snapshot.ENTRIES.items():
+        for params in params_fn(ctx):
+            _assert_same(fn(ctx, *params), snap.get(snapshot.entry_key(name, params)))
+
+
+def _rewrite_manifest(src, dst, **changes):
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w') as zout:
+        for item in zin.infolist():
+            data = zin.read(item)
+            if item.filename == snapshot.MANIFEST:
+                data = json.dumps({**json.loads(data), **changes}, ensure_ascii=False).encode()
+            zout.writestr(item, data)
+    return str(dst)
+
+
+@pytest.mark.parametrize('field', ['format', 'fingerprint', 'definitions', 'code'])
+def test_rejects_drift(data_dir, snap_path, tmp_path, caplog, field):
+    stale = _rewrite_manifest(snap_path, tmp_path / 'stale.zip', **{field: 'old'})
+    with caplog.at_level(logging.WARNING, logger=snapshot.__name__):
+        assert snapshot.open_snapshot(stale, data_dir) is None
+    assert field in caplog.text
+
+
+def test_definitions_hash_tracks_cohort_rules(monkeypatch):
+    before = snapshot.definitions_hash()
+    monkeypatch.setitem(constants.COHORT_RULES, 'churn_days', 60)
+    assert snapshot.definitions_hash() != before
@@ -0,0 +1,34 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from roundlab.constants import LIFESTYLE_TAGS, PATTERNS
+from roundlab.tagger import ATTR_TAGGER, STYLE_TAGGER, MultiPatternTagger, bit_matrix, style_text
+
+
+def _naive_bits(texts, patterns):
+    """패턴마다 str.contains 를 따로 돌린 결과 (행 × 패턴 0/1)."""
+    s = texts.astype(object).fillna('').astype(str)
+    return np.column_stack([s.str.contains(p, na=False).to_numpy() for p in patterns.values()]).astype(np.uint8)
+
+
+def test_attr_bits_match_str_contains(df):
+    bits = ATTR_TAGGER.tag(df['content'])
+    np.testing.assert_array_equal(bit_matrix(bits, len(PATTERNS)), _naive_bits(df['content'], PATTERNS))
+
+
+def test_style_bits_match_str_contains(df):
+    texts = style_text(df)
+    patterns = {k: '|'.join(map(re.escape, v)) for k, v in LIFESTYLE_TAGS.items()}
+    bits = STYLE_TAGGER.tag(texts)
+    np.testing.assert_array_equal(bit_matrix(bits, len(patterns)), _naive_bits(texts, patterns))
+
+
+def test_overlapping_keywords():
+    # 접두어 키워드('가'), 매치 안에서 시작하는 키워드('따가격' 안의 '가격'), 정규식 패턴(fallback), 결측
+    patterns = {'a': '따가|따가워', 'b': '가격|비싸', 'c': '가', 'd': r'촉촉\s*해'}
+    texts = pd.Series(['따가격이 좀', '따가워요', '촉촉 해요', '비싸다', '', None, '가격따가'])
+    tagger = MultiPatternTagger(patterns)
+    assert tagger.fallback  # 'd' 는 정규식이라 따로 검사
+    np.testing.assert_array_equal(bit_matrix(tagger.tag(texts), len(patterns)), _naive_bits(texts, patterns))
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from roundlab import terms
+from roundlab.terms import METHODS, TermIndex
+
+PLANTED = '뷁쀍'  # 합성 본문에 없는 음절 2개 → 2-gram 하나
+
+
+def test_chunked_build_matches_one_shot(df, monkeypatch):
+    sub = df.iloc[:3_000]
+    whole = TermIndex(sub)
+    monkeypatch.setattr(terms, 'CHUNK_DOCS', 37)
+    chunked = TermIndex(sub)
+    assert chunked.terms.equals(whole.terms)
+    np.testing.assert_array_equal(chunked.doc_codes, whole.doc_codes)
+    assert chunked.D.shape == whole.D.shape
+    assert (chunked.D != whole.D).nnz == 0
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_planted_ngram_sign(df, method):
+    content = df['content'].iloc[:2_000].astype(str).to_numpy().copy()
+    rows_a = np.zeros(len(content), dtype=bool)
+    rows_a[:1_000] = True
+    planted = np.flatnonzero(rows_a)[::4]
+    content[planted] = [f'{c} {PLANTED} {i}' for i, c in zip(planted, content[planted])]  # 문서마다 다른 본문
+    index = TermIndex(pd.DataFrame({'content': content}))
+    assert PLANTED in index.terms
+
+    top = index.contrast(rows_a, ~rows_a, method=method, top_k=5)
+    assert top['Term'].iloc[0] == PLANTED
+    assert top['Score'].iloc[0] > 0
+    assert top['A(%)'].iloc[0] == pytest.approx(len(planted) / rows_a.sum() * 100)
+    assert top['B(%)'].iloc[0] == 0
+
+    reverse = index.contrast(~rows_a, rows_a, method=method, top_k=len(index.terms))
+    assert reverse.set_index('Term').loc[PLANTED, 'Score'] < 0